@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,8 +8,54 @@ class Settings(BaseSettings):
     app_version: str = "2.0.0"
     cors_origins: str = "*"
     semantic_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    similarity_backend: str = "embedding"
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    bm25_stats_path: str = ""
     default_required_skills: str = "Python,FastAPI,React,SQL,Django"
     context_window_size: int = 50
+    pdf_backend: str = "pdfplumber"
+    pdf_max_pages: int = 50
+    pdf_max_words: int = 50000
+    pdf_deadline_seconds: float = 20.0
+    pdf_max_parsers: int = 4
+    layout_analysis: bool = True
+    max_occurrences_per_skill: int = 8
+    evidence_aggregation: Literal["max", "topk_mean"] = "max"
+    evidence_top_k: int = 3
+    semantic_discovery: bool = False
+    chunk_max_tokens: int = 40
+    discovery_min_similarity: float = 0.7
+    taxonomy_index_path: str = ""
+    taxonomy_min_similarity: float = 0.75
+    taxonomy_min_confidence: float = 0.3
+    taxonomy_max_skills: int = 50
+    verification_mode: str = "bi_encoder"
+    cross_encoder_model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    # Bi-encoder scores are (cos + 1) / 2; sentence-transformer cosines between a skill and
+    # a resume snippet mostly fall in 0.1-0.6, so a wide band would escalate nearly every pair.
+    cascade_lower: float = 0.62
+    cascade_upper: float = 0.74
+    cascade_max_fraction: float = 0.3
+    leaderboard_size: int = 100
+    leaderboard_retention_hours: float = 168.0
+    micro_batching: bool = True
+    batch_max_size: int = 64
+    batch_max_wait_ms: float = 5.0
+    request_coalescing: bool = True
+    server_workers: int = 4
+    worker_torch_threads: int = 0
+    worker_max_requests: int = 1000
+    worker_max_requests_jitter: int = 100
+    worker_timeout: int = 120
+    job_queue_path: str = "data/analysis_jobs.sqlite3"
+    job_workers: int = 2
+    job_max_attempts: int = 3
+    job_lease_seconds: float = 300.0
+    job_poll_interval: float = 0.5
+    job_retention_hours: float = 24.0
+    geometry_gzip_level: int = 6
+    model_memory_budget_mb: float = 0.0
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -1,25 +1,80 @@
 from __future__ import annotations
 
+import gzip
 import os
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Awaitable
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+import numpy as np
+from fastapi import FastAPI, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.schemas import AnalyzeResponse, HealthResponse, SkillResult
+from app.schemas import (
+    AnalysisJobResponse,
+    AnalyzeResponse,
+    BatchingStats,
+    CoalescingStats,
+    EvidenceLocation,
+    HealthResponse,
+    JobPriority,
+    JobQueueStats,
+    LeaderboardEntry,
+    LeaderboardResponse,
+    ModelRegistryStats,
+    RankCandidatesRequest,
+    RankingInput,
+    SkillResult,
+    VerificationStats,
+)
+from app.services.batch_scheduler import EmbeddingBatchScheduler
+from app.services.cascade import VerificationCascade
+from app.services.chunk_index import (
+    ChunkIndex,
+    DocumentChunk,
+    chunk_coordinate,
+    document_chunks,
+)
 from app.services.contextual_verifier import (
     ContextualVerifier,
+    aggregate_confidence,
     coordinate_weight,
     integrity_score,
 )
-from app.services.spatial_extractor import SpatialExtractor
+from app.services.geometry import GEOMETRY_FORMAT_DOC, GEOMETRY_MEDIA_TYPE, pack_geometry
+from app.services.job_queue import JobFailed, JobWorkerPool, SQLiteJobStore
+from app.services.lexical_scorer import BM25WindowIndex, LexicalStats
+from app.services.patent_ranking import JobLeaderboard, LeaderboardMismatch, LeaderboardRegistry
+from app.services.shared_core import (
+    ExtractionBusy,
+    ExtractionLimits,
+    ExtractionReport,
+    iter_pages,
+    model_registry,
+    set_max_parsers,
+)
+from app.services.single_flight import SingleFlight, content_key
+from app.services.spatial_extractor import ParsedDocument, SpatialExtractor
+from app.services.taxonomy_index import TaxonomyIndex, TaxonomyIndexMismatch
+from app.services.verifier_engine import SemanticVerifier
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if job_workers is not None:
+        job_workers.start()
+    yield
+    if job_workers is not None:
+        await job_workers.stop()
 
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
+    lifespan=lifespan,
 )
 
 # -------------------- CORS --------------------
@@ -38,8 +93,62 @@ app.add_middleware(
 )
 
 # -------------------- Services --------------------
-extractor = SpatialExtractor()
-verifier = ContextualVerifier(settings.semantic_model_name)
+model_registry.set_budget(int(settings.model_memory_budget_mb * 2**20))
+set_max_parsers(settings.pdf_max_parsers)
+extractor = SpatialExtractor(
+    use_layout=settings.layout_analysis,
+    limits=ExtractionLimits(
+        max_pages=settings.pdf_max_pages,
+        max_words=settings.pdf_max_words,
+        deadline_seconds=settings.pdf_deadline_seconds,
+    ),
+)
+lexical_stats = (
+    LexicalStats.load(settings.bm25_stats_path)
+    if settings.bm25_stats_path
+    else LexicalStats.default(settings.context_window_size)
+)
+verifier = ContextualVerifier(
+    settings.semantic_model_name,
+    load=settings.similarity_backend != "bm25",
+    lexical_stats=lexical_stats,
+)
+scheduler = (
+    EmbeddingBatchScheduler(
+        verifier.encode,
+        max_batch_size=settings.batch_max_size,
+        max_wait_ms=settings.batch_max_wait_ms,
+    )
+    if settings.micro_batching and verifier.model is not None
+    else None
+)
+cascade = (
+    VerificationCascade(
+        SemanticVerifier(settings.cross_encoder_model_name, lexical_stats=lexical_stats),
+        lower=settings.cascade_lower,
+        upper=settings.cascade_upper,
+        max_fraction=settings.cascade_max_fraction,
+    )
+    if settings.verification_mode == "cascade"
+    else None
+)
+taxonomy = (
+    TaxonomyIndex(settings.taxonomy_index_path, model_name=settings.semantic_model_name)
+    if settings.taxonomy_index_path
+    else None
+)
+analyze_flights = SingleFlight() if settings.request_coalescing else None
+# Boards share the job queue's SQLite file so every server process sees the same shortlist.
+leaderboards = LeaderboardRegistry(
+    settings.job_queue_path,
+    k=settings.leaderboard_size,
+    retention_seconds=settings.leaderboard_retention_hours * 3600,
+)
+job_store = SQLiteJobStore(
+    settings.job_queue_path,
+    max_attempts=settings.job_max_attempts,
+    lease_seconds=settings.job_lease_seconds,
+)
 
 
 # -------------------- Health Check --------------------
@@ -51,6 +160,107 @@ def health() -> HealthResponse:
     )
 
 
+# -------------------- Inference Metrics --------------------
+@app.get("/metrics/batching", response_model=BatchingStats)
+def batching_stats() -> BatchingStats:
+    if scheduler is None:
+        return BatchingStats(enabled=False)
+    return BatchingStats(enabled=True, **scheduler.stats())
+
+
+@app.get("/metrics/coalescing", response_model=CoalescingStats)
+def coalescing_stats() -> CoalescingStats:
+    if analyze_flights is None:
+        return CoalescingStats(enabled=False)
+    return CoalescingStats(enabled=True, **analyze_flights.stats())
+
+
+@app.get("/metrics/jobs", response_model=JobQueueStats)
+def job_queue_stats() -> JobQueueStats:
+    workers = job_workers.stats() if job_workers is not None else {}
+    return JobQueueStats(**job_store.stats(), **workers)
+
+
+@app.get("/metrics/models", response_model=ModelRegistryStats)
+def model_stats() -> ModelRegistryStats:
+    return ModelRegistryStats(**model_registry.stats())
+
+
+# -------------------- Leaderboards --------------------
+def _leaderboard_response(board: JobLeaderboard, k: int | None = None) -> LeaderboardResponse:
+    return LeaderboardResponse(
+        job_id=board.job_id,
+        skills=board.skills,
+        total_candidates=len(board),
+        entries=[
+            LeaderboardEntry(rank=rank, candidate_id=candidate_id, score=score)
+            for rank, (candidate_id, score) in enumerate(board.top(k), start=1)
+        ],
+    )
+
+
+def _leaderboard(job_id: str, skills: list[str], importance: list[float] | None) -> JobLeaderboard:
+    try:
+        return leaderboards.get_or_create(job_id, skills, importance)
+    except LeaderboardMismatch as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+def _record_candidate(
+    job_id: str,
+    candidate_id: str,
+    skills: list[str],
+    importance: list[float] | None,
+    results: list[SkillResult],
+) -> None:
+    """
+    Upsert one analysed candidate into the job's leaderboard.
+
+    ``confidence_score`` already folds in the coordinate weight, so the ranking
+    engine gets the raw ``semantic_similarity`` and applies the weight once.
+    """
+    board = _leaderboard(job_id, skills, importance)
+    confidence, spatial = board.vectorize(
+        RankingInput(
+            skill=item.skill,
+            confidence=item.semantic_similarity,
+            spatial_weight=item.coordinate_weight,
+        )
+        for item in results
+    )
+    board.add([candidate_id], confidence[None, :], spatial[None, :])
+
+
+@app.post("/jobs/{job_id}/candidates", response_model=LeaderboardResponse)
+def rank_candidates(job_id: str, request: RankCandidatesRequest) -> LeaderboardResponse:
+    if request.importance is not None and len(request.importance) != len(request.skills):
+        raise HTTPException(
+            status_code=400,
+            detail="importance must have one value per skill.",
+        )
+
+    board = _leaderboard(job_id, request.skills, request.importance)
+    if request.candidates:
+        rows = [board.vectorize(candidate.skills) for candidate in request.candidates]
+        board.add(
+            [candidate.candidate_id for candidate in request.candidates],
+            np.stack([confidence for confidence, _ in rows]),
+            np.stack([spatial for _, spatial in rows]),
+        )
+    return _leaderboard_response(board)
+
+
+@app.get("/jobs/{job_id}/leaderboard", response_model=LeaderboardResponse)
+def job_leaderboard(job_id: str, k: int | None = None) -> LeaderboardResponse:
+    board = leaderboards.get(job_id)
+    if board is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No leaderboard for job '{job_id}'.",
+        )
+    return _leaderboard_response(board, k)
+
+
 # -------------------- Helper --------------------
 def _persist_upload_bytes(pdf_bytes: bytes) -> Path:
     """
@@ -72,13 +282,7 @@ def _persist_upload_bytes(pdf_bytes: bytes) -> Path:
     return Path(temp_path)
 
 
-# -------------------- Resume Analyzer --------------------
-@app.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_resume(
-    resume: UploadFile = File(...),
-    job_skills: str = Form(default=""),
-) -> AnalyzeResponse:
-
+async def _read_pdf_upload(resume: UploadFile) -> bytes:
     filename = (resume.filename or "").lower()
     if not filename.endswith(".pdf"):
         raise HTTPException(
@@ -92,25 +296,22 @@ async def analyze_resume(
             status_code=400,
             detail="Uploaded PDF is empty.",
         )
+    return content
 
-    # Parse required skills
-    skills = [
-        s.strip()
-        for s in (job_skills or settings.default_required_skills).split(",")
-        if s.strip()
-    ]
-
-    if not skills:
-        raise HTTPException(
-            status_code=400,
-            detail="No skills provided for verification.",
-        )
 
+def _parse_pdf(content: bytes, pdf_backend: str = "") -> ParsedDocument:
     temp_path: Path | None = None
 
     try:
         temp_path = _persist_upload_bytes(content)
-        parsed = extractor.extract(temp_path)
+        parsed = extractor.extract(temp_path, backend=pdf_backend or None)
+
+    except ExtractionBusy as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
 
     except Exception as exc:
         raise HTTPException(
@@ -130,56 +331,222 @@ async def analyze_resume(
             status_code=422,
             detail="No text detected in PDF. Please upload text-based PDF.",
         )
+    return parsed
+
+
+async def _encode(texts: list[str]) -> np.ndarray:
+    if scheduler is not None:
+        return await scheduler.encode_async(texts)
+    return await run_in_threadpool(verifier.encode, texts)
+
+
+def _chunk_evidence(
+    parsed: ParsedDocument,
+    chunk: DocumentChunk,
+    semantic_similarity: float,
+) -> EvidenceLocation:
+    section = extractor.section_for(parsed, chunk.token_indices[0])
+    c_weight = coordinate_weight(section)
+    return EvidenceLocation(
+        coordinates=chunk_coordinate(parsed.tokens, chunk),
+        confidence_score=integrity_score(c_weight, semantic_similarity),
+        semantic_similarity=semantic_similarity,
+        coordinate_weight=c_weight,
+        evidence_snippet=chunk.text[:400],
+        section=section,
+    )
 
-    lowered_tokens = [token.text.lower() for token in parsed.tokens]
+
+def _skill_results(
+    evidence_by_skill: dict[str, list[EvidenceLocation]],
+    semantic_skills: set[str],
+    include_evidence: bool,
+) -> list[SkillResult]:
     results: list[SkillResult] = []
 
-    for skill in skills:
-        skill_key = skill.lower()
+    for skill, evidence in evidence_by_skill.items():
+        evidence.sort(
+            key=lambda item: item.confidence_score,
+            reverse=True,
+        )
+        best = evidence[0]
 
-        # Exact match
-        hit_index = next(
-            (i for i, token in enumerate(lowered_tokens) if token == skill_key),
-            None,
+        confidence = aggregate_confidence(
+            [item.confidence_score for item in evidence],
+            settings.evidence_aggregation,
+            settings.evidence_top_k,
         )
 
-        # Partial match fallback
-        if hit_index is None:
-            hit_index = next(
-                (i for i, token in enumerate(lowered_tokens) if skill_key in token),
-                None,
+        results.append(
+            SkillResult(
+                skill=skill,
+                coordinates=best.coordinates,
+                confidence_score=confidence,
+                semantic_similarity=best.semantic_similarity,
+                coordinate_weight=best.coordinate_weight,
+                evidence_snippet=best.evidence_snippet,
+                section=best.section,
+                occurrences=len(evidence),
+                match_type="semantic" if skill in semantic_skills else "literal",
+                evidence=evidence[: settings.evidence_top_k] if include_evidence else [],
             )
+        )
 
-        if hit_index is None:
-            continue
+    results.sort(
+        key=lambda item: item.confidence_score,
+        reverse=True,
+    )
+    return results
+
+
+async def _discover_semantic_evidence(
+    parsed: ParsedDocument,
+    skills: list[str],
+) -> dict[str, list[EvidenceLocation]]:
+    """
+    Find skills that never appear literally by searching layout chunks.
 
-        token = parsed.tokens[hit_index]
+    All chunks and skills are embedded in one encode call, then every skill is
+    scored against every chunk with a single matrix multiply and top-k pick.
+    """
+    chunks = document_chunks(parsed.tokens, parsed.layout, settings.chunk_max_tokens)
+    if not chunks:
+        return {}
+
+    embeddings = await _encode([chunk.text for chunk in chunks] + skills)
+
+    index = ChunkIndex(chunks, embeddings[: len(chunks)])
+    top_indices, top_scores = index.search(
+        embeddings[len(chunks) :],
+        settings.evidence_top_k,
+    )
+
+    discovered: dict[str, list[EvidenceLocation]] = {}
+    for skill, chunk_ids, scores in zip(skills, top_indices, top_scores):
+        evidence: list[EvidenceLocation] = []
+        for chunk_id, semantic_similarity in zip(chunk_ids, scores):
+            if semantic_similarity < settings.discovery_min_similarity:
+                break
+            evidence.append(
+                _chunk_evidence(parsed, chunks[chunk_id], float(semantic_similarity))
+            )
+        if evidence:
+            discovered[skill] = evidence
+    return discovered
 
-        _, page_height = parsed.page_sizes.get(
-            token.coordinate.page,
-            (1.0, 1.0),
+
+# -------------------- Resume Analyzer --------------------
+def _parse_skills(job_skills: str) -> list[str]:
+    skills = [
+        s.strip()
+        for s in (job_skills or settings.default_required_skills).split(",")
+        if s.strip()
+    ]
+
+    if not skills:
+        raise HTTPException(
+            status_code=400,
+            detail="No skills provided for verification.",
         )
+    return skills
 
-        section = extractor.classify_section(
-            token.coordinate.y0,
-            page_height,
+
+def _parse_importance(skill_importance: str, skills: list[str]) -> list[float] | None:
+    if not skill_importance.strip():
+        return None
+    try:
+        importance = [float(value) for value in skill_importance.split(",")]
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail="skill_importance must be comma-separated numbers.",
+        ) from exc
+    if len(importance) != len(skills):
+        raise HTTPException(
+            status_code=400,
+            detail="skill_importance must have one value per skill.",
         )
+    return importance
 
-        snippet = extractor.context(
-            parsed.tokens,
-            hit_index,
+
+async def _analyze(
+    content: bytes,
+    skills: list[str],
+    importance: list[float] | None = None,
+    include_evidence: bool = False,
+    pdf_backend: str = "",
+    job_id: str = "",
+    candidate_id: str = "",
+) -> AnalyzeResponse:
+    # Parse off the event loop so background job workers never stall requests.
+    parsed = await run_in_threadpool(_parse_pdf, content, pdf_backend)
+
+    lowered_tokens = [token.text.lower() for token in parsed.tokens]
+
+    # Collect every (deduplicated, capped) occurrence of every skill first so
+    # all contexts can be embedded in a single batched pass.
+    occurrences: list[tuple[str, int, str, str]] = []
+    spans: list[tuple[int, int]] = []
+    for skill in skills:
+        hit_indices = extractor.occurrences(
+            parsed,
+            lowered_tokens,
+            skill.lower(),
             settings.context_window_size,
+            settings.max_occurrences_per_skill,
         )
 
-        semantic_similarity = verifier.similarity(skill, snippet)
-        c_weight = coordinate_weight(section)
-        confidence = integrity_score(c_weight, semantic_similarity)
+        for hit_index in hit_indices:
+            section = extractor.section_for(parsed, hit_index)
 
-        results.append(
-            SkillResult(
-                skill=skill,
-                coordinates=token.coordinate,
-                confidence_score=confidence,
+            span = extractor.context_span(
+                parsed,
+                hit_index,
+                settings.context_window_size,
+            )
+            snippet = " ".join(
+                parsed.tokens[i].text for i in parsed.reading_order[span[0] : span[1]]
+            )
+
+            occurrences.append((skill, hit_index, section, snippet))
+            spans.append(span)
+
+    pairs = [(skill, snippet) for skill, _, _, snippet in occurrences]
+    lexical = verifier.model is None
+    if lexical:
+        # The document is indexed once, in the same reading order the snippets are
+        # cut from, and every hit's snippet is scored against its skill's profile.
+        lexical_index = BM25WindowIndex(
+            [lowered_tokens[i] for i in parsed.reading_order],
+            spans,
+            stats=lexical_stats,
+            k1=settings.bm25_k1,
+            b=settings.bm25_b,
+        )
+        similarities = lexical_index.span_scores([skill for skill, _, _, _ in occurrences])
+    elif scheduler is not None:
+        similarities = await verifier.similarities_async(pairs, scheduler)
+    else:
+        # Jobs share this event loop; a direct encode would stall every request.
+        similarities = await run_in_threadpool(verifier.similarities, pairs)
+
+    escalated = 0
+    if cascade is not None:
+        similarities, escalated = await run_in_threadpool(
+            cascade.escalate,
+            pairs,
+            similarities,
+        )
+
+    evidence_by_skill: dict[str, list[EvidenceLocation]] = {}
+    for (skill, hit_index, section, snippet), semantic_similarity in zip(
+        occurrences, similarities
+    ):
+        c_weight = coordinate_weight(section)
+        evidence_by_skill.setdefault(skill, []).append(
+            EvidenceLocation(
+                coordinates=parsed.tokens[hit_index].coordinate,
+                confidence_score=integrity_score(c_weight, semantic_similarity),
                 semantic_similarity=semantic_similarity,
                 coordinate_weight=c_weight,
                 evidence_snippet=snippet[:400],
@@ -187,13 +554,259 @@ async def analyze_resume(
             )
         )
 
-    results.sort(
-        key=lambda item: item.confidence_score,
-        reverse=True,
+    semantic_skills: set[str] = set()
+    missing = [skill for skill in skills if skill not in evidence_by_skill]
+    if settings.semantic_discovery and missing and verifier.model is not None:
+        discovered = await _discover_semantic_evidence(parsed, missing)
+        evidence_by_skill.update(discovered)
+        semantic_skills.update(discovered)
+
+    results = _skill_results(evidence_by_skill, semantic_skills, include_evidence)
+
+    if job_id and candidate_id:
+        # SQLite writes wait on a busy lock; keep them off the event loop.
+        await run_in_threadpool(_record_candidate, job_id, candidate_id, skills, importance, results)
+
+    return AnalyzeResponse(
+        skills=results,
+        total_detected=len(results),
+        model=settings.semantic_model_name,
+        verification=VerificationStats(
+            mode="cascade" if cascade is not None else "bm25" if lexical else "bi_encoder",
+            pairs=len(pairs),
+            escalated=escalated,
+            cross_encoder_model=settings.cross_encoder_model_name if cascade is not None else None,
+        ),
+        partial=parsed.partial,
+        partial_reason=parsed.partial_reason,
     )
 
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_resume(
+    resume: UploadFile = File(...),
+    job_skills: str = Form(default=""),
+    include_evidence: bool = Form(default=False),
+    pdf_backend: str = Form(default=""),
+    job_id: str = Form(default=""),
+    candidate_id: str = Form(default=""),
+    skill_importance: str = Form(default=""),
+) -> AnalyzeResponse:
+
+    content = await _read_pdf_upload(resume)
+    skills = _parse_skills(job_skills)
+    importance = _parse_importance(skill_importance, skills)
+
+    def run() -> Awaitable[AnalyzeResponse]:
+        return _analyze(
+            content,
+            skills,
+            importance,
+            include_evidence,
+            pdf_backend,
+            job_id,
+            candidate_id,
+        )
+
+    if analyze_flights is None:
+        return await run()
+
+    # Identical concurrent uploads (same bytes, skill set and model) share one analysis.
+    # The leaderboard target is part of the key so each candidate is still recorded.
+    key = (
+        content_key(content),
+        tuple(sorted(zip(skills, importance or [1.0] * len(skills)))),
+        settings.semantic_model_name,
+        include_evidence,
+        pdf_backend,
+        job_id,
+        candidate_id,
+    )
+    return await analyze_flights.run(key, run)
+
+
+# -------------------- Analysis Jobs --------------------
+async def _run_analysis_job(params: dict, payload: bytes) -> dict:
+    try:
+        response = await _analyze(payload, **params)
+    except HTTPException as exc:
+        if exc.status_code == 503:
+            raise  # transient (all PDF readers busy): let the queue retry it
+        raise JobFailed(exc.detail) from exc
+    return response.model_dump()
+
+
+job_workers = (
+    JobWorkerPool(
+        job_store,
+        _run_analysis_job,
+        workers=settings.job_workers,
+        poll_interval=settings.job_poll_interval,
+        retention_seconds=settings.job_retention_hours * 3600,
+    )
+    if settings.job_workers > 0
+    else None
+)
+
+
+@app.post("/analyze/jobs", response_model=AnalysisJobResponse, status_code=202)
+async def enqueue_analysis(
+    resume: UploadFile = File(...),
+    job_skills: str = Form(default=""),
+    include_evidence: bool = Form(default=False),
+    pdf_backend: str = Form(default=""),
+    job_id: str = Form(default=""),
+    candidate_id: str = Form(default=""),
+    skill_importance: str = Form(default=""),
+    priority: JobPriority = Form(default="normal"),
+) -> AnalysisJobResponse:
+    """Queue a resume for background analysis and return immediately; poll ``GET /analyze/jobs/{id}``."""
+    content = await _read_pdf_upload(resume)
+    skills = _parse_skills(job_skills)
+    importance = _parse_importance(skill_importance, skills)
+
+    params = {
+        "skills": skills,
+        "importance": importance,
+        "include_evidence": include_evidence,
+        "pdf_backend": pdf_backend,
+        "job_id": job_id,
+        "candidate_id": candidate_id,
+    }
+    analysis_id = await run_in_threadpool(job_store.enqueue, params, content, priority)
+    if job_workers is not None:
+        job_workers.notify()
+    return await analysis_job(analysis_id)
+
+
+@app.get("/analyze/jobs/{analysis_id}", response_model=AnalysisJobResponse)
+async def analysis_job(analysis_id: str) -> AnalysisJobResponse:
+    job = await run_in_threadpool(job_store.get, analysis_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No analysis job '{analysis_id}'.",
+        )
+    return AnalysisJobResponse(**job)
+
+# -------------------- Taxonomy Extraction --------------------
+@app.post("/extract", response_model=AnalyzeResponse)
+async def extract_skills(
+    resume: UploadFile = File(...),
+    include_evidence: bool = Form(default=False),
+    pdf_backend: str = Form(default=""),
+) -> AnalyzeResponse:
+    """Find every taxonomy skill present in a resume, without a caller-supplied list."""
+    if taxonomy is None:
+        raise HTTPException(
+            status_code=503,
+            detail="No taxonomy index configured. Build one with build_taxonomy_index.py "
+            "and set TAXONOMY_INDEX_PATH.",
+        )
+    if verifier.model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Taxonomy extraction requires the embedding model.",
+        )
+
+    content = await _read_pdf_upload(resume)
+    parsed = await run_in_threadpool(_parse_pdf, content, pdf_backend)
+
+    chunks = document_chunks(parsed.tokens, parsed.layout, settings.chunk_max_tokens)
+    chunk_embeddings = await _encode([chunk.text for chunk in chunks])
+    try:
+        hits = await run_in_threadpool(
+            taxonomy.search,
+            chunk_embeddings,
+            settings.taxonomy_min_similarity,
+            settings.taxonomy_max_skills,
+        )
+    except TaxonomyIndexMismatch as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    evidence_by_skill: dict[str, list[EvidenceLocation]] = {}
+    for skill_id, chunk_id, semantic_similarity in hits:
+        evidence = _chunk_evidence(parsed, chunks[chunk_id], semantic_similarity)
+        if evidence.confidence_score < settings.taxonomy_min_confidence:
+            continue
+        evidence_by_skill[taxonomy.skills[skill_id]] = [evidence]
+
+    results = _skill_results(evidence_by_skill, set(evidence_by_skill), include_evidence)
     return AnalyzeResponse(
         skills=results,
         total_detected=len(results),
         model=settings.semantic_model_name,
-    )
\ No newline at end of file
+        partial=parsed.partial,
+        partial_reason=parsed.partial_reason,
+    )
+
+
+# -------------------- X-Ray Geometry --------------------
+def _pack_pdf_geometry(content: bytes, pdf_backend: str) -> tuple[bytes, ExtractionReport]:
+    temp_path: Path | None = None
+    report = ExtractionReport()
+
+    try:
+        temp_path = _persist_upload_bytes(content)
+        pages = iter_pages(
+            temp_path,
+            pdf_backend or settings.pdf_backend,
+            extractor.limits,
+            report,
+        )
+        return pack_geometry(pages), report
+
+    except ExtractionBusy as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
+
+    except Exception as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unable to parse PDF: {exc}",
+        ) from exc
+
+    finally:
+        if temp_path and temp_path.exists():
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+
+
+@app.post(
+    "/geometry",
+    response_class=Response,
+    responses={
+        200: {
+            "content": {GEOMETRY_MEDIA_TYPE: {}},
+            "description": "Packed token geometry." + GEOMETRY_FORMAT_DOC,
+        }
+    },
+)
+async def document_geometry(
+    request: Request,
+    resume: UploadFile = File(...),
+    pdf_backend: str = Form(default=""),
+) -> Response:
+    """
+    Every word box of a resume as packed typed arrays for the X-Ray overlay.
+
+    Boxes are float32 in PDF points, page ids are uint16 page numbers starting at 1
+    (as in ``Coordinate.page``), and words are offsets into a single UTF-8 blob.
+    Page sizes are sent once. The payload is gzip-encoded when the client accepts it. Documents cut short by the extraction limits carry
+    an ``X-Partial-Result`` header naming the limit.
+    """
+    content = await _read_pdf_upload(resume)
+    payload, report = await run_in_threadpool(_pack_pdf_geometry, content, pdf_backend)
+
+    headers = {"Vary": "Accept-Encoding"}
+    if report.truncated:
+        headers["X-Partial-Result"] = report.reason
+    if "gzip" in request.headers.get("accept-encoding", "") and settings.geometry_gzip_level > 0:
+        payload = await run_in_threadpool(gzip.compress, payload, settings.geometry_gzip_level)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=payload, media_type=GEOMETRY_MEDIA_TYPE, headers=headers)
@@ -5,6 +5,18 @@ from typing import Literal
 from pydantic import BaseModel, ConfigDict, Field
 
 
+SectionName = Literal[
+    "header",
+    "body",
+    "footer",
+    "experience",
+    "skills",
+    "projects",
+    "education",
+    "hobbies",
+]
+
+
 class Coordinate(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -24,6 +36,47 @@ class SpatialToken(BaseModel):
     coordinate: Coordinate
 
 
+class WordBox(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    text: str = Field(min_length=1)
+    x0: float
+    x1: float
+    top: float
+    bottom: float
+    section: str
+
+
+class ParsedDocument(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    words: list[WordBox]
+    full_text: str
+
+
+class SkillEvidence(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    skill: str
+    context_window: str
+    semantic_proof_score: float = Field(ge=0.0, le=1.0)
+    confidence: float = Field(ge=0.0, le=1.0)
+    reasoning: str
+    section: str
+    spatial_weight: float = Field(ge=0.0, le=1.0)
+
+
+class EvidenceLocation(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    coordinates: Coordinate
+    confidence_score: float = Field(ge=0.0, le=1.0)
+    semantic_similarity: float = Field(ge=0.0, le=1.0)
+    coordinate_weight: float = Field(ge=0.0, le=1.0)
+    evidence_snippet: str
+    section: SectionName
+
+
 class SkillResult(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -33,7 +86,19 @@ class SkillResult(BaseModel):
     semantic_similarity: float = Field(ge=0.0, le=1.0)
     coordinate_weight: float = Field(ge=0.0, le=1.0)
     evidence_snippet: str
-    section: Literal["header", "body", "footer"]
+    section: SectionName
+    occurrences: int = Field(default=1, ge=1)
+    match_type: Literal["literal", "semantic"] = "literal"
+    evidence: list[EvidenceLocation] = Field(default_factory=list)
+
+
+class VerificationStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    mode: Literal["bi_encoder", "bm25", "cascade"]
+    pairs: int = Field(ge=0)
+    escalated: int = Field(ge=0)
+    cross_encoder_model: str | None = None
 
 
 class AnalyzeResponse(BaseModel):
@@ -42,6 +107,77 @@ class AnalyzeResponse(BaseModel):
     skills: list[SkillResult]
     total_detected: int = Field(ge=0)
     model: str
+    verification: VerificationStats | None = None
+    partial: bool = False
+    partial_reason: Literal["max_pages", "max_words", "deadline"] | None = None
+
+
+JobPriority = Literal["high", "normal", "low"]
+
+
+class AnalysisJobResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: str
+    status: Literal["queued", "running", "done", "failed"]
+    priority: JobPriority
+    attempts: int = Field(default=0, ge=0)
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: AnalyzeResponse | None = None
+    error: str | None = None
+
+
+class RankingInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    skill: str
+    importance: float = Field(default=1.0, ge=0.0)
+    confidence: float = Field(ge=0.0, le=1.0)
+    spatial_weight: float = Field(ge=0.0, le=1.0)
+
+
+class RankedSkill(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    skill: str
+    importance: float
+    confidence: float
+    spatial_weight: float
+    weighted_score: float
+
+
+class CandidateRankingInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    candidate_id: str = Field(min_length=1)
+    skills: list[RankingInput]
+
+
+class RankCandidatesRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    skills: list[str] = Field(min_length=1)
+    importance: list[float] | None = None
+    candidates: list[CandidateRankingInput]
+
+
+class LeaderboardEntry(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    rank: int = Field(ge=1)
+    candidate_id: str
+    score: float
+
+
+class LeaderboardResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    job_id: str
+    skills: list[str]
+    total_candidates: int = Field(ge=0)
+    entries: list[LeaderboardEntry]
 
 
 class HealthResponse(BaseModel):
@@ -49,3 +185,68 @@ class HealthResponse(BaseModel):
 
     status: Literal["ok"]
     service: str
+
+
+class BatchingStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool
+    batches: int = 0
+    requests: int = 0
+    texts: int = 0
+    mean_batch_size: float = 0.0
+    max_batch_size: int = 0
+    mean_requests_per_batch: float = 0.0
+    mean_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    mean_encode_ms: float = 0.0
+    queue_depth: int = 0
+
+
+class CoalescingStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool
+    executions: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+
+
+class JobQueueStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    queued: int = 0
+    running: int = 0
+    done: int = 0
+    failed: int = 0
+    queue_depth_by_priority: dict[str, int] = Field(default_factory=dict)
+    oldest_queued_age_s: float = 0.0
+    retried: int = 0
+    workers: int = 0
+    busy_workers: int = 0
+    processed: int = 0
+    worker_failures: int = 0
+
+
+class RegisteredModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    backend: str
+    name: str
+    options: list[str] = Field(default_factory=list)
+    memory_bytes: int = Field(ge=0)
+    load_seconds: float = Field(ge=0.0)
+    hits: int = Field(ge=0)
+    refcount: int = Field(ge=0)
+    last_used: float
+
+
+class ModelRegistryStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    budget_bytes: int = Field(ge=0)
+    resident_bytes: int = Field(ge=0)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    models: list[RegisteredModel] = Field(default_factory=list)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass
+class _EncodeRequest:
+    texts: list[str]
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBatchScheduler:
+    """
+    Dynamic micro-batcher shared by all concurrent requests in a process.
+
+    Callers submit the texts they need embedded and get a future back. A single
+    background thread drains the queue, waiting at most ``max_wait_ms`` after the
+    first pending request (or until ``max_batch_size`` texts are queued), encodes
+    the de-duplicated union in one call and routes each caller its rows.
+
+    The worker thread is started lazily and restarted after a fork, so the
+    scheduler is safe to construct in a pre-fork master process.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[list[str]], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: queue.Queue[_EncodeRequest] = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._pid: int | None = None
+
+        self._batches = 0
+        self._requests = 0
+        self._texts = 0
+        self._max_batch = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._encode_total = 0.0
+
+    def submit(self, texts: list[str]) -> Future:
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        self._ensure_worker()
+        self._queue.put(_EncodeRequest(texts=list(texts), future=future))
+        return future
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+    async def encode_async(self, texts: list[str]) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            batches = max(self._batches, 1)
+            requests = max(self._requests, 1)
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "texts": self._texts,
+                "mean_batch_size": self._texts / batches,
+                "max_batch_size": self._max_batch,
+                "mean_requests_per_batch": self._requests / batches,
+                "mean_wait_ms": 1000.0 * self._wait_total / requests,
+                "max_wait_ms": 1000.0 * self._wait_max,
+                "mean_encode_ms": 1000.0 * self._encode_total / batches,
+                "queue_depth": self._queue.qsize(),
+            }
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._worker = threading.Thread(
+                target=self._run,
+                name="embedding-batch-scheduler",
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _collect(self) -> list[_EncodeRequest]:
+        batch = [self._queue.get()]
+        pending = len(batch[0].texts)
+        deadline = time.perf_counter() + self.max_wait
+        while pending < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            pending += len(request.texts)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            # Claim each future; callers that cancelled while queued are dropped here
+            # and their futures can no longer be cancelled once claimed.
+            batch = [request for request in self._collect() if request.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._process(batch)
+            except Exception as exc:
+                # Never let one bad batch stop the worker thread.
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+
+    def _process(self, batch: list[_EncodeRequest]) -> None:
+        flushed_at = time.perf_counter()
+
+        texts = list(dict.fromkeys(text for request in batch for text in request.texts))
+        position = {text: i for i, text in enumerate(texts)}
+
+        try:
+            embeddings = np.asarray(self.encode_fn(texts))
+        except Exception as exc:
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+
+        encode_time = time.perf_counter() - flushed_at
+        for request in batch:
+            rows = [position[text] for text in request.texts]
+            request.future.set_result(embeddings[rows])
+
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._texts += len(texts)
+            self._max_batch = max(self._max_batch, len(texts))
+            self._encode_total += encode_time
+            for request in batch:
+                wait = flushed_at - request.enqueued_at
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from app.services.verifier_engine import SemanticVerifier
+
+
+class VerificationCascade:
+    """
+    Second verification stage for ambiguous bi-encoder scores.
+
+    Pairs whose bi-encoder similarity falls inside ``[lower, upper]`` are
+    re-scored in one batch by the cross-encoder. Clear accepts and rejects keep
+    their cheap score and never reach the expensive model.
+
+    The cross-encoder's probability is mapped linearly onto the band
+    (``lower + p * (upper - lower)``). Escalated and cheap scores therefore stay
+    on the one bi-encoder scale: the cross-encoder reorders pairs inside the
+    ambiguous band but never pushes a pair above a clear accept or below a
+    clear reject. At most ``max_fraction`` of a request's pairs are escalated,
+    taking those nearest the middle of the band first, which bounds the cost if
+    the band is set too wide for the embedding model.
+    """
+
+    def __init__(
+        self,
+        cross_encoder: SemanticVerifier,
+        lower: float,
+        upper: float,
+        max_fraction: float = 1.0,
+    ) -> None:
+        self.cross_encoder = cross_encoder
+        self.lower = lower
+        self.upper = upper
+        self.max_fraction = max(0.0, min(1.0, max_fraction))
+
+    def escalate(
+        self,
+        pairs: list[tuple[str, str]],
+        similarities: list[float],
+    ) -> tuple[list[float], int]:
+        """Return refined similarities and how many pairs were escalated."""
+        ambiguous = [
+            i for i, score in enumerate(similarities) if self.lower <= score <= self.upper
+        ]
+        budget = max(1, int(self.max_fraction * len(pairs))) if self.max_fraction else 0
+        if len(ambiguous) > budget:
+            middle = (self.lower + self.upper) / 2
+            ambiguous = sorted(sorted(ambiguous, key=lambda i: abs(similarities[i] - middle))[:budget])
+        if not ambiguous:
+            return list(similarities), 0
+
+        proofs = self.cross_encoder.semantic_proofs([pairs[i] for i in ambiguous])
+        refined = list(similarities)
+        for i, proof in zip(ambiguous, proofs):
+            refined[i] = self.lower + proof * (self.upper - self.lower)
+        return refined, len(ambiguous)
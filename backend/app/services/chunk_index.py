@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.schemas import Coordinate, SpatialToken
+
+
+@dataclass
+class DocumentChunk:
+    token_indices: list[int]
+    text: str
+
+
+def document_chunks(tokens: list[SpatialToken], layout, max_tokens: int) -> list[DocumentChunk]:
+    """Chunk a document along layout lines, or fixed token windows without a layout."""
+    if layout is not None:
+        groups = layout.line_chunks(max_tokens)
+    else:
+        groups = [
+            list(range(start, min(start + max_tokens, len(tokens))))
+            for start in range(0, len(tokens), max_tokens)
+        ]
+    return [
+        DocumentChunk(
+            token_indices=group,
+            text=" ".join(tokens[i].text for i in group),
+        )
+        for group in groups
+        if group
+    ]
+
+
+def chunk_coordinate(tokens: list[SpatialToken], chunk: DocumentChunk) -> Coordinate:
+    """Bounding box of a chunk, restricted to the page of its first token."""
+    first = tokens[chunk.token_indices[0]].coordinate
+    boxes = [
+        tokens[i].coordinate
+        for i in chunk.token_indices
+        if tokens[i].coordinate.page == first.page
+    ]
+    return Coordinate(
+        x0=min(c.x0 for c in boxes),
+        y0=min(c.y0 for c in boxes),
+        x1=max(c.x1 for c in boxes),
+        y1=max(c.y1 for c in boxes),
+        page_width=first.page_width,
+        page_height=first.page_height,
+        page=first.page,
+    )
+
+
+class ChunkIndex:
+    """Normalized chunk embedding matrix searched with one matmul + partial top-k."""
+
+    def __init__(self, chunks: list[DocumentChunk], embeddings: np.ndarray) -> None:
+        self.chunks = chunks
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-``k`` chunks for every query row.
+
+        Returns ``(indices, scores)``, both shaped (queries, k) and sorted best
+        first. Scores are cosine similarities mapped to [0, 1] like
+        ``ContextualVerifier.similarity``.
+        """
+        sims = np.asarray(queries, dtype=np.float32) @ self.embeddings.T
+        k = max(1, min(k, sims.shape[1]))
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+        indices = np.take_along_axis(top, order, axis=1)
+        scores = np.clip((np.take_along_axis(top_sims, order, axis=1) + 1.0) / 2.0, 0.0, 1.0)
+        return indices, scores
@@ -4,6 +4,10 @@ import math
 
 import numpy as np
 
+from app.services.batch_scheduler import EmbeddingBatchScheduler
+from app.services.lexical_scorer import LexicalStats, bm25_pair_scores
+from app.services.shared_core import model_registry
+
 try:
     from sentence_transformers import SentenceTransformer
 except Exception:  # pragma: no cover
@@ -11,15 +15,26 @@ except Exception:  # pragma: no cover
 
 
 class ContextualVerifier:
-    def __init__(self, model_name: str) -> None:
+    def __init__(self, model_name: str, load: bool = True, lexical_stats: LexicalStats | None = None) -> None:
         self.model_name = model_name
+        self.lexical_stats = lexical_stats
         self.model = None
-        if SentenceTransformer is not None:
+        if load and SentenceTransformer is not None:
             try:
-                self.model = SentenceTransformer(model_name)
+                self.model = model_registry.acquire(
+                    "sentence-transformers",
+                    model_name,
+                    lambda: SentenceTransformer(model_name),
+                )
             except Exception:
                 self.model = None
 
+    def close(self) -> None:
+        """Return the shared model to the registry; it stays cached until evicted."""
+        if self.model is not None:
+            model_registry.release("sentence-transformers", self.model_name)
+            self.model = None
+
     def similarity(self, skill: str, snippet: str) -> float:
         if not snippet.strip():
             return 0.0
@@ -31,18 +46,73 @@ class ContextualVerifier:
         score = float(np.dot(embeddings[0], embeddings[1]))
         return float(max(0.0, min(1.0, (score + 1.0) / 2.0)))
 
+    def encode(self, texts: list[str]) -> np.ndarray:
+        return self.model.encode(texts, normalize_embeddings=True)
+
+    def similarities(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score many (skill, snippet) pairs with a single batched encode call."""
+        if not pairs:
+            return []
+
+        if self.model is None:
+            return self._fallback_similarities(pairs)
+
+        texts = self._unique_texts(pairs)
+        return self._score_pairs(pairs, texts, self.encode(texts))
+
+    async def similarities_async(
+        self,
+        pairs: list[tuple[str, str]],
+        scheduler: EmbeddingBatchScheduler,
+    ) -> list[float]:
+        """Like ``similarities`` but routes the encode through the shared micro-batcher."""
+        if not pairs:
+            return []
+
+        if self.model is None:
+            return self._fallback_similarities(pairs)
+
+        texts = self._unique_texts(pairs)
+        return self._score_pairs(pairs, texts, await scheduler.encode_async(texts))
+
     @staticmethod
-    def _fallback_similarity(skill: str, snippet: str) -> float:
-        skill_terms = set(skill.lower().split())
-        snippet_terms = set(snippet.lower().split())
-        if not skill_terms:
-            return 0.0
-        overlap = len(skill_terms & snippet_terms) / len(skill_terms)
-        return max(0.05, min(1.0, overlap))
+    def _unique_texts(pairs: list[tuple[str, str]]) -> list[str]:
+        return list(dict.fromkeys(text for pair in pairs for text in pair))
+
+    @staticmethod
+    def _score_pairs(
+        pairs: list[tuple[str, str]],
+        texts: list[str],
+        embeddings: np.ndarray,
+    ) -> list[float]:
+        position = {text: i for i, text in enumerate(texts)}
+        scores: list[float] = []
+        for skill, snippet in pairs:
+            if not snippet.strip():
+                scores.append(0.0)
+                continue
+            score = float(np.dot(embeddings[position[skill]], embeddings[position[snippet]]))
+            scores.append(float(max(0.0, min(1.0, (score + 1.0) / 2.0))))
+        return scores
+
+    def _fallback_similarities(self, pairs: list[tuple[str, str]]) -> list[float]:
+        return bm25_pair_scores(pairs, self.lexical_stats)
+
+    def _fallback_similarity(self, skill: str, snippet: str) -> float:
+        return bm25_pair_scores([(skill, snippet)], self.lexical_stats)[0]
 
 
 def coordinate_weight(section: str) -> float:
-    mapping = {"header": 1.0, "body": 0.75, "footer": 0.35}
+    mapping = {
+        "header": 1.0,
+        "body": 0.75,
+        "footer": 0.35,
+        "experience": 1.0,
+        "skills": 0.8,
+        "projects": 0.5,
+        "education": 0.4,
+        "hobbies": 0.2,
+    }
     return mapping.get(section, 0.5)
 
 
@@ -51,3 +121,16 @@ def integrity_score(coord_weight: float, semantic_similarity: float) -> float:
     if math.isnan(score):
         return 0.0
     return max(0.0, min(1.0, score))
+
+
+def aggregate_confidence(scores: list[float], method: str = "max", top_k: int = 3) -> float:
+    """Collapse per-occurrence integrity scores into one per-skill confidence."""
+    if not scores:
+        return 0.0
+    if method not in {"max", "topk_mean"}:
+        raise ValueError(f"Unknown evidence aggregation '{method}'; use 'max' or 'topk_mean'.")
+    ordered = sorted(scores, reverse=True)
+    if method == "topk_mean":
+        head = ordered[: max(1, top_k)]
+        return max(0.0, min(1.0, sum(head) / len(head)))
+    return ordered[0]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import struct
+from typing import Iterable
+
+import numpy as np
+
+from app.services.shared_core import ExtractedPage
+
+MAGIC = b"SXG1"
+HEADER = struct.Struct("<4sIII")
+
+GEOMETRY_MEDIA_TYPE = "application/vnd.skillextract.geometry"
+
+GEOMETRY_FORMAT_DOC = """
+Little-endian binary layout. Every array begins at an offset that is a multiple of its
+element size, so it can be viewed in place without copying:
+
+| field        | type                 | length          |
+|--------------|----------------------|-----------------|
+| magic        | 4 bytes `SXG1`       | 1               |
+| token_count  | uint32               | 1               |
+| page_count   | uint32               | 1               |
+| text_bytes   | uint32               | 1               |
+| page_sizes   | float32 (w, h)       | page_count * 2  |
+| boxes        | float32 (x0, y0, x1, y1) in PDF points | token_count * 4 |
+| text_offsets | uint32               | token_count + 1 |
+| pages        | uint16 (1-based page number) | token_count |
+| text         | UTF-8 bytes          | text_bytes      |
+
+Token `i`'s text is `text[text_offsets[i]:text_offsets[i + 1]]`. Text offsets count
+bytes, not characters. Page numbers start at 1, matching `Coordinate.page` in `/analyze`
+evidence, so page `k`'s size is `page_sizes[2 * (k - 1)]` and `page_sizes[2 * (k - 1) + 1]`.
+
+```js
+function decodeGeometry(buf) {
+  const dv = new DataView(buf);
+  const n = dv.getUint32(4, true), p = dv.getUint32(8, true), t = dv.getUint32(12, true);
+  let o = 16;
+  const pageSizes = new Float32Array(buf, o, p * 2); o += p * 8;
+  const boxes = new Float32Array(buf, o, n * 4); o += n * 16;
+  const offsets = new Uint32Array(buf, o, n + 1); o += (n + 1) * 4;
+  const pages = new Uint16Array(buf, o, n); o += n * 2;
+  const text = new Uint8Array(buf, o, t);
+  const dec = new TextDecoder();
+  const word = (i) => dec.decode(text.subarray(offsets[i], offsets[i + 1]));
+  const pageSize = (page) => pageSizes.subarray((page - 1) * 2, page * 2);
+  return { pageSizes, boxes, offsets, pages, word, pageSize };
+}
+```
+"""
+
+
+def pack_geometry(pages: Iterable[ExtractedPage]) -> bytes:
+    """Pack every word box of a document into the layout described by ``GEOMETRY_FORMAT_DOC``."""
+    page_sizes: list[tuple[float, float]] = []
+    boxes: list[tuple[float, float, float, float]] = []
+    page_ids: list[int] = []
+    encoded: list[bytes] = []
+
+    for page in pages:
+        page_sizes.append((page.width, page.height))
+        for word in page.words:
+            boxes.append((word.x0, word.top, word.x1, word.bottom))
+            encoded.append(word.text.encode("utf-8"))
+        page_ids.extend([page.index + 1] * len(page.words))
+
+    if len(page_sizes) > np.iinfo(np.uint16).max:
+        raise ValueError("Documents with more than 65535 pages cannot be packed.")
+
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    text = b"".join(encoded)
+
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, len(boxes), len(page_sizes), len(text)),
+            np.asarray(page_sizes, dtype="<f4").reshape(-1, 2).tobytes(),
+            np.asarray(boxes, dtype="<f4").reshape(-1, 4).tobytes(),
+            offsets.tobytes(),
+            np.asarray(page_ids, dtype="<u2").tobytes(),
+            text,
+        ]
+    )
+
+
+def unpack_geometry(data: bytes) -> dict[str, np.ndarray | list[str]]:
+    """Reference decoder: arrays are zero-copy views over ``data``."""
+    magic, n, p, t = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a packed geometry payload.")
+
+    offset = HEADER.size
+    page_sizes = np.frombuffer(data, "<f4", p * 2, offset).reshape(p, 2)
+    offset += page_sizes.nbytes
+    boxes = np.frombuffer(data, "<f4", n * 4, offset).reshape(n, 4)
+    offset += boxes.nbytes
+    text_offsets = np.frombuffer(data, "<u4", n + 1, offset)
+    offset += text_offsets.nbytes
+    pages = np.frombuffer(data, "<u2", n, offset)
+    offset += pages.nbytes
+    text = data[offset : offset + t]
+
+    return {
+        "page_sizes": page_sizes,
+        "boxes": boxes,
+        "pages": pages,
+        "text_offsets": text_offsets,
+        "words": [text[a:b].decode("utf-8") for a, b in zip(text_offsets[:-1], text_offsets[1:])],
+    }
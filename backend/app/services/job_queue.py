@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    payload BLOB,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at);
+"""
+
+
+class JobFailed(Exception):
+    """Raised by a job handler for errors that retrying cannot fix (bad input)."""
+
+
+class SQLiteJobStore:
+    """
+    Durable job queue in a single SQLite file.
+
+    Every call opens its own connection, so the store is safe to share across
+    threads and across pre-forked server processes. Claiming runs in a
+    ``BEGIN IMMEDIATE`` transaction, so exactly one worker gets each job. Running
+    jobs hold a lease. A lease that expires (the worker crashed or was recycled)
+    puts the job back in its lane until ``max_attempts`` is exhausted.
+    """
+
+    def __init__(self, path: str | Path, max_attempts: int = 3, lease_seconds: float = 300.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max(1, max_attempts)
+        self.lease_seconds = max(1.0, lease_seconds)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Autocommit connection that is closed on exit (sqlite3's own context manager only commits)."""
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, params: dict[str, Any], payload: bytes, priority: str = "normal") -> str:
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of: {', '.join(PRIORITIES)}")
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, priority, status, params, payload, created_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, PRIORITIES[priority], json.dumps(params), payload, time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, priority, status, result, error, attempts, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["priority"] = next(name for name, rank in PRIORITIES.items() if rank == job["priority"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def claim(self, worker: str) -> dict[str, Any] | None:
+        """Lease the oldest job in the highest non-empty lane, after requeueing expired leases."""
+        now = time.time()
+        with self._connect() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Worker lost too many times.', payload = NULL, "
+                    "finished_at = ?, worker = NULL WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', worker = NULL "
+                    "WHERE status = 'running' AND lease_expires_at < ?",
+                    (now,),
+                )
+                row = conn.execute(
+                    "SELECT id, params, payload, attempts FROM jobs WHERE status = 'queued' "
+                    "ORDER BY priority, created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                    "lease_expires_at = ?, started_at = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, row["id"]),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return {
+            "id": row["id"],
+            "params": json.loads(row["params"]),
+            "payload": row["payload"],
+            "attempt": row["attempts"] + 1,
+        }
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + self.lease_seconds, job_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result: dict[str, Any]) -> bool:
+        return self._finish(job_id, worker, "done", result=json.dumps(result))
+
+    def fail(self, job_id: str, worker: str, error: str, retry: bool = False) -> bool:
+        with self._connect() as conn:
+            if retry:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'queued', worker = NULL, error = ? "
+                    "WHERE id = ? AND worker = ? AND status = 'running' AND attempts < ?",
+                    (error, job_id, worker, self.max_attempts),
+                )
+                if cursor.rowcount == 1:
+                    return True
+        return self._finish(job_id, worker, "failed", error=error)
+
+    def _finish(self, job_id: str, worker: str, status: str, result: str | None = None, error: str | None = None) -> bool:
+        """Record a terminal state; a worker whose lease was taken over cannot overwrite it."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, worker = NULL, finished_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (status, result, error, time.time(), job_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def purge(self, older_than_seconds: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (time.time() - older_than_seconds,),
+            )
+        return cursor.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        with self._connect() as conn:
+            by_status = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            by_lane = dict(
+                conn.execute("SELECT priority, COUNT(*) FROM jobs WHERE status = 'queued' GROUP BY priority").fetchall()
+            )
+            oldest = conn.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            retried = conn.execute("SELECT COUNT(*) FROM jobs WHERE attempts > 1").fetchone()[0]
+        return {
+            "queued": by_status.get("queued", 0),
+            "running": by_status.get("running", 0),
+            "done": by_status.get("done", 0),
+            "failed": by_status.get("failed", 0),
+            "queue_depth_by_priority": {name: by_lane.get(rank, 0) for name, rank in PRIORITIES.items()},
+            "oldest_queued_age_s": time.time() - oldest if oldest is not None else 0.0,
+            "retried": retried,
+        }
+
+
+JobHandler = Callable[[dict[str, Any], bytes], Awaitable[dict[str, Any]]]
+
+
+class JobWorkerPool:
+    """
+    Background asyncio workers that drain a ``SQLiteJobStore``.
+
+    Workers run inside the serving event loop so jobs reuse the process's models
+    and embedding micro-batcher. Store calls run in the threadpool. While a job
+    runs, its lease is renewed every third of ``lease_seconds``. A
+    ``JobFailed`` from the handler fails the job straight away. Any other
+    exception is retried until the store's ``max_attempts`` is used up.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteJobStore,
+        handler: JobHandler,
+        workers: int = 2,
+        poll_interval: float = 0.5,
+        retention_seconds: float = 86400.0,
+    ) -> None:
+        self.store = store
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.poll_interval = max(0.01, poll_interval)
+        self.retention_seconds = retention_seconds
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._processed = 0
+        self._failed = 0
+        self._busy = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        prefix = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks = [asyncio.create_task(self._run(f"{prefix}-{i}")) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers in this process instead of waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": len(self._tasks),
+            "busy_workers": self._busy,
+            "processed": self._processed,
+            "worker_failures": self._failed,
+        }
+
+    async def _idle(self) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _heartbeat(self, job_id: str, worker: str) -> None:
+        """Renew the lease until cancelled; a failed renewal is logged and retried on the next beat."""
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            try:
+                renewed = await run_in_threadpool(self.store.heartbeat, job_id, worker)
+            except Exception:
+                logger.exception("Lease renewal for job %s failed", job_id)
+                continue
+            if not renewed:
+                logger.warning("Job %s lease was taken over; its result will be discarded", job_id)
+                return
+
+    async def _run(self, worker: str) -> None:
+        last_purge = 0.0
+        while True:
+            try:
+                if time.monotonic() - last_purge > 3600:
+                    last_purge = time.monotonic()
+                    await run_in_threadpool(self.store.purge, self.retention_seconds)
+                job = await run_in_threadpool(self.store.claim, worker)
+            except Exception:
+                logger.exception("Job store unavailable")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if job is None:
+                await self._idle()
+                continue
+
+            self._busy += 1
+            heartbeat = asyncio.create_task(self._heartbeat(job["id"], worker))
+            try:
+                result = await self.handler(job["params"], job["payload"])
+                await run_in_threadpool(self.store.complete, job["id"], worker, result)
+                self._processed += 1
+            except asyncio.CancelledError:
+                raise
+            except JobFailed as exc:
+                await run_in_threadpool(self.store.fail, job["id"], worker, str(exc))
+                self._failed += 1
+            except Exception as exc:
+                logger.exception("Job %s failed on attempt %d", job["id"], job["attempt"])
+                await run_in_threadpool(self.store.fail, job["id"], worker, repr(exc), True)
+                self._failed += 1
+            finally:
+                heartbeat.cancel()
+                self._busy -= 1
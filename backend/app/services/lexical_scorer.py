@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import math
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+_PUNCTUATION = ".,;:!?()[]{}<>\"'`|/\\*"
+
+# Words that mark a skill as applied rather than merely named. Without corpus
+# statistics every skill is scored against this profile.
+EVIDENCE_TERMS = (
+    "built", "developed", "designed", "implemented", "deployed", "maintained", "migrated",
+    "optimized", "automated", "engineered", "integrated", "created", "wrote", "led", "used",
+    "using", "production", "services", "service", "pipelines", "pipeline", "systems", "api",
+    "apis", "platform", "applications", "backend", "frontend", "infrastructure", "data",
+    "models", "framework", "development", "engineer", "developer", "projects", "years",
+)
+
+
+def normalize_terms(text: str) -> list[str]:
+    return [term for term in (raw.strip(_PUNCTUATION) for raw in text.lower().split()) if term]
+
+
+class LexicalStats:
+    """
+    Precomputed context profiles for the BM25 scorer.
+
+    ``profiles[skill]`` maps the terms that surround the skill in a resume corpus
+    to ``P(term in context | skill) * idf(term)``, with idf taken over the whole
+    corpus. ``profiles[""]`` pools every skill and serves skills the corpus never
+    mentions. ``build_lexical_stats.py`` produces the file offline; ``default``
+    is the file-less fallback, a flat ``EVIDENCE_TERMS`` profile.
+    """
+
+    def __init__(
+        self,
+        profiles: dict[str, dict[str, float]],
+        avg_window_length: float,
+        documents: int = 0,
+    ) -> None:
+        self.profiles = profiles
+        self.avg_window_length = max(avg_window_length, 1.0)
+        self.documents = documents
+
+    @classmethod
+    def default(cls, window: int = 50) -> LexicalStats:
+        return cls({"": {term: 1.0 for term in EVIDENCE_TERMS}}, avg_window_length=2 * window)
+
+    @classmethod
+    def load(cls, path: str | Path) -> LexicalStats:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data["profiles"], data["avg_window_length"], data.get("documents", 0))
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "documents": self.documents,
+            "avg_window_length": self.avg_window_length,
+            "profiles": self.profiles,
+        }
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        return path
+
+    def profile(self, skill: str) -> dict[str, float]:
+        """Context profile for ``skill``, without the skill's own terms."""
+        own = normalize_terms(skill)
+        profile = self.profiles.get(" ".join(own)) or self.profiles.get("", {})
+        return {term: weight for term, weight in profile.items() if term not in own and weight > 0}
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[list[str]],
+        skills: list[str],
+        window: int = 50,
+        profile_size: int = 64,
+        min_mentions: int = 5,
+    ) -> LexicalStats:
+        """
+        Count document frequencies and skill/context co-occurrences over tokenized resumes.
+
+        Skills mentioned fewer than ``min_mentions`` times get no profile of their own
+        and fall back to the pooled one.
+        """
+        keys = list(dict.fromkeys(" ".join(normalize_terms(skill)) for skill in skills if normalize_terms(skill)))
+        by_first: dict[str, list[list[str]]] = defaultdict(list)
+        for key in keys:
+            by_first[key.split()[0]].append(key.split())
+
+        df: Counter[str] = Counter()
+        mentions: Counter[str] = Counter()
+        cooccur: dict[str, Counter[str]] = defaultdict(Counter)
+        total_length = 0
+        count = 0
+        for tokens in documents:
+            terms = [" ".join(normalize_terms(token)) for token in tokens]
+            count += 1
+            df.update(set(terms))
+            for i, term in enumerate(terms):
+                for parts in by_first.get(term, ()):
+                    if terms[i : i + len(parts)] != parts:
+                        continue
+                    context = terms[max(0, i - window) : i] + terms[i + len(parts) : i + len(parts) + window]
+                    context = [t for t in context if t and t not in parts]
+                    key = " ".join(parts)
+                    mentions[key] += 1
+                    cooccur[key].update(set(context))
+                    total_length += len(context)
+
+        def idf(term: str) -> float:
+            return math.log(1.0 + (count - df[term] + 0.5) / (df[term] + 0.5))
+
+        def top(weights: dict[str, float], size: int) -> dict[str, float]:
+            ranked = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:size]
+            return {term: round(weight, 4) for term, weight in ranked}
+
+        profiles: dict[str, dict[str, float]] = {}
+        pooled: Counter[str] = Counter()
+        for key, counts in cooccur.items():
+            pooled.update(counts)
+            if mentions[key] >= min_mentions:
+                weights = {term: n / mentions[key] * idf(term) for term, n in counts.items()}
+                profiles[key] = top(weights, profile_size)
+        total_mentions = sum(mentions.values())
+        if total_mentions:
+            profiles[""] = top({term: n / total_mentions * idf(term) for term, n in pooled.items()}, profile_size)
+
+        avg_length = total_length / total_mentions if total_mentions else 2 * window
+        return cls(profiles, avg_window_length=avg_length, documents=count)
+
+
+class BM25WindowIndex:
+    """
+    BM25 over the context windows (spans) of one document.
+
+    The document is stored once as an int32 term-id array. Each term's sorted
+    positions give its frequency in any set of windows with two ``searchsorted``
+    calls, so no term-by-window matrix is materialized.
+
+    Window ``i`` is scored against the precomputed context profile of
+    ``queries[i]``. Each window contains its hit, so the skill's own terms are
+    left out of both the query and the window length: the score says whether
+    the surrounding words look like the contexts the skill appears in. The
+    average window length comes from ``stats`` as well, so a window's score
+    does not depend on the other windows in the request. A window holding the
+    profile's three strongest terms once each scores 1.0.
+    """
+
+    reference_terms = 3
+
+    def __init__(
+        self,
+        tokens: list[str],
+        spans: list[tuple[int, int]],
+        stats: LexicalStats | None = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.stats = stats or LexicalStats.default()
+        self.k1 = k1
+        self.b = b
+
+        terms = [" ".join(normalize_terms(token)) for token in tokens]
+        self.vocab: dict[str, int] = {}
+        ids = np.fromiter(
+            (self.vocab.setdefault(term, len(self.vocab)) for term in terms),
+            dtype=np.int32,
+            count=len(terms),
+        )
+
+        order = np.argsort(ids, kind="stable")
+        boundaries = np.searchsorted(ids[order], np.arange(len(self.vocab) + 1))
+        self._positions = [order[boundaries[i] : boundaries[i + 1]] for i in range(len(self.vocab))]
+
+        self.starts = np.array([start for start, _ in spans], dtype=np.int64)
+        self.ends = np.array([end for _, end in spans], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def term_frequencies(self, term: str, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            return np.zeros(len(starts), dtype=np.float64)
+        positions = self._positions[term_id]
+        return (np.searchsorted(positions, ends) - np.searchsorted(positions, starts)).astype(np.float64)
+
+    def span_scores(self, queries: list[str]) -> list[float]:
+        """Score window ``i`` against ``queries[i]``; windows of the same skill share one pass."""
+        scores = np.zeros(len(queries))
+        rows_by_query: dict[str, list[int]] = defaultdict(list)
+        for row, query in enumerate(queries):
+            rows_by_query[query].append(row)
+
+        for query, rows in rows_by_query.items():
+            profile = self.stats.profile(query)
+            if not profile:
+                continue
+            starts, ends = self.starts[rows], self.ends[rows]
+            own = sum(self.term_frequencies(term, starts, ends) for term in set(normalize_terms(query)))
+            lengths = np.maximum((ends - starts) - own, 0.0)
+            length_norm = self.k1 * (1.0 - self.b + self.b * lengths / self.stats.avg_window_length)
+
+            weights = np.fromiter(profile.values(), dtype=np.float64, count=len(profile))
+            tf = np.stack([self.term_frequencies(term, starts, ends) for term in profile])
+            saturated = tf * (self.k1 + 1.0) / (tf + length_norm[None, :])
+            reference = np.sort(weights)[-self.reference_terms :].sum()
+            scores[rows] = np.minimum(weights @ saturated / reference, 1.0)
+        return [float(score) for score in scores]
+
+
+def bm25_pair_scores(
+    pairs: list[tuple[str, str]],
+    stats: LexicalStats | None = None,
+    k1: float = 1.2,
+    b: float = 0.75,
+) -> list[float]:
+    """
+    Score ``(skill, snippet)`` pairs without a parsed document.
+
+    The snippets are laid end to end as one document with one window per pair,
+    so each skill is scored against exactly its own snippet.
+    """
+    if not pairs:
+        return []
+    tokens: list[str] = []
+    spans: list[tuple[int, int]] = []
+    for _, snippet in pairs:
+        terms = normalize_terms(snippet)
+        spans.append((len(tokens), len(tokens) + len(terms)))
+        tokens.extend(terms)
+    index = BM25WindowIndex(tokens, spans, stats=stats, k1=k1, b=b)
+    return index.span_scores([skill for skill, _ in pairs])
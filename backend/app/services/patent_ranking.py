@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
 
 from app.schemas import RankedSkill, RankingInput
 
@@ -10,19 +17,202 @@ class PatentRankingEngine:
 
     @staticmethod
     def rank(entries: Iterable[RankingInput]) -> tuple[list[RankedSkill], float]:
-        ranked: list[RankedSkill] = []
-        total = 0.0
+        items = list(entries)
+        if not items:
+            return [], 0.0
+
+        importance = np.fromiter((item.importance for item in items), dtype=np.float64, count=len(items))
+        confidence = np.fromiter((item.confidence for item in items), dtype=np.float64, count=len(items))
+        spatial = np.fromiter((item.spatial_weight for item in items), dtype=np.float64, count=len(items))
+        weighted = importance * confidence * spatial
+
+        ranked = [
+            RankedSkill(
+                skill=items[i].skill,
+                importance=items[i].importance,
+                confidence=items[i].confidence,
+                spatial_weight=items[i].spatial_weight,
+                weighted_score=float(weighted[i]),
+            )
+            for i in np.argsort(-weighted, kind="stable")
+        ]
+        return ranked, float(weighted.sum())
+
+    @staticmethod
+    def score_matrix(
+        importance: np.ndarray,
+        confidence: np.ndarray,
+        spatial_weight: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized S_final for many candidates at once.
+
+        ``importance`` has shape (skills,); ``confidence`` and ``spatial_weight``
+        have shape (candidates, skills). Returns one score per candidate.
+        """
+        return (np.asarray(confidence, dtype=np.float64) * np.asarray(spatial_weight, dtype=np.float64)) @ np.asarray(
+            importance, dtype=np.float64
+        )
+
+
+class LeaderboardMismatch(ValueError):
+    """A job's leaderboard already exists with a different skill set or importance."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboards (
+    job_id TEXT PRIMARY KEY,
+    skills TEXT NOT NULL,
+    importance TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaderboard_scores (
+    job_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (job_id, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS leaderboard_rank ON leaderboard_scores (job_id, score DESC);
+"""
+
+
+@contextmanager
+def _connect(path: Path) -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+class JobLeaderboard:
+    """
+    Top-k shortlist of candidates for one job, stored in SQLite.
+
+    A batch of uploads is scored with one vectorized ``score_matrix`` call and
+    upserted in one transaction. ``top`` reads the shortlist through the
+    ``(job_id, score DESC)`` index, so it costs O(k log n) and never touches every
+    applicant. Because the scores live in the shared database file, every server
+    process sees the same leaderboard.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        job_id: str,
+        skills: Sequence[str],
+        importance: Sequence[float] | None = None,
+        k: int = 100,
+    ) -> None:
+        self.path = path
+        self.job_id = job_id
+        self.skills = list(skills)
+        self.skill_index = {skill.lower(): i for i, skill in enumerate(self.skills)}
+        self.importance = np.asarray(importance if importance is not None else [1.0] * len(self.skills), dtype=np.float64)
+        self.k = max(1, k)
+
+    def __len__(self) -> int:
+        with _connect(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM leaderboard_scores WHERE job_id = ?", (self.job_id,)).fetchone()[0]
+
+    def matches(self, skills: Sequence[str], importance: Sequence[float] | None = None) -> bool:
+        weights = importance if importance is not None else [1.0] * len(skills)
+        requested = {skill.lower(): float(weight) for skill, weight in zip(skills, weights)}
+        stored = {skill.lower(): float(weight) for skill, weight in zip(self.skills, self.importance)}
+        return requested == stored
+
+    def vectorize(self, entries: Iterable[RankingInput]) -> tuple[np.ndarray, np.ndarray]:
+        """Confidence and spatial-weight rows (one per job skill) for one candidate."""
+        confidence = np.zeros(len(self.skills), dtype=np.float64)
+        spatial = np.zeros(len(self.skills), dtype=np.float64)
         for item in entries:
-            weighted = item.importance * item.confidence * item.spatial_weight
-            total += weighted
-            ranked.append(
-                RankedSkill(
-                    skill=item.skill,
-                    importance=item.importance,
-                    confidence=item.confidence,
-                    spatial_weight=item.spatial_weight,
-                    weighted_score=weighted,
-                )
+            column = self.skill_index.get(item.skill.lower())
+            if column is not None:
+                confidence[column] = item.confidence
+                spatial[column] = item.spatial_weight
+        return confidence, spatial
+
+    def add(self, candidate_ids: Sequence[str], confidence: np.ndarray, spatial_weight: np.ndarray) -> np.ndarray:
+        """Score a (candidates × skills) batch and upsert it; a re-upload replaces the old score."""
+        scores = PatentRankingEngine.score_matrix(self.importance, confidence, spatial_weight)
+        with _connect(self.path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO leaderboard_scores (job_id, candidate_id, score) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id, candidate_id) DO UPDATE SET score = excluded.score",
+                [(self.job_id, candidate_id, float(score)) for candidate_id, score in zip(candidate_ids, scores)],
+            )
+            conn.execute("UPDATE leaderboards SET updated_at = ? WHERE job_id = ?", (time.time(), self.job_id))
+            conn.execute("COMMIT")
+        return scores
+
+    def top(self, k: int | None = None) -> list[tuple[str, float]]:
+        k = self.k if k is None else max(1, k)
+        with _connect(self.path) as conn:
+            rows = conn.execute(
+                "SELECT candidate_id, score FROM leaderboard_scores WHERE job_id = ? "
+                "ORDER BY score DESC, candidate_id LIMIT ?",
+                (self.job_id, k),
+            ).fetchall()
+        return [(candidate_id, float(score)) for candidate_id, score in rows]
+
+
+class LeaderboardRegistry:
+    """
+    Job id → leaderboard, persisted in a SQLite file shared by all server processes.
+
+    A board's skills and importance are fixed by the first request for its job.
+    A later request with a different set raises ``LeaderboardMismatch`` instead of
+    being scored against the wrong columns. Boards not updated for
+    ``retention_seconds`` are purged (checked at most once an hour).
+    """
+
+    def __init__(self, path: str | Path, k: int = 100, retention_seconds: float = 7 * 86400.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k = k
+        self.retention_seconds = retention_seconds
+        self._last_purge = 0.0
+        with _connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def get(self, job_id: str) -> JobLeaderboard | None:
+        with _connect(self.path) as conn:
+            row = conn.execute("SELECT skills, importance FROM leaderboards WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return JobLeaderboard(self.path, job_id, json.loads(row[0]), json.loads(row[1]), self.k)
+
+    def get_or_create(self, job_id: str, skills: Sequence[str], importance: Sequence[float] | None = None) -> JobLeaderboard:
+        self._maybe_purge()
+        weights = list(importance) if importance is not None else [1.0] * len(skills)
+        with _connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO leaderboards (job_id, skills, importance, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(list(skills)), json.dumps(weights), time.time()),
             )
-        ranked.sort(key=lambda x: x.weighted_score, reverse=True)
-        return ranked, total
+        board = self.get(job_id)
+        if not board.matches(skills, importance):
+            raise LeaderboardMismatch(
+                f"Job '{job_id}' is ranked on skills {board.skills} with importance "
+                f"{board.importance.tolist()}; send the same skill set or use a new job id."
+            )
+        return board
+
+    def purge(self, older_than_seconds: float) -> int:
+        cutoff = time.time() - older_than_seconds
+        with _connect(self.path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM leaderboard_scores WHERE job_id IN (SELECT job_id FROM leaderboards WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            deleted = conn.execute("DELETE FROM leaderboards WHERE updated_at < ?", (cutoff,)).rowcount
+            conn.execute("COMMIT")
+        return deleted
+
+    def _maybe_purge(self) -> None:
+        if self.retention_seconds > 0 and time.monotonic() - self._last_purge > 3600:
+            self._last_purge = time.monotonic()
+            self.purge(self.retention_seconds)
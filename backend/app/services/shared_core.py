@@ -0,0 +1,38 @@
+"""Re-exports from the repository's ``src/`` package shared with the backend."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+try:
+    import src.pipeline.preprocess  # noqa: F401
+except ImportError:  # backend launched from backend/ without the repo root on sys.path
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.dl_models.registry import ModelRegistry, model_registry
+from src.pipeline.preprocess import SECTION_PATTERNS
+from src.spatial_engine.extraction import (
+    BACKENDS as PDF_BACKENDS,
+    ExtractedPage,
+    ExtractedWord,
+    ExtractionBusy,
+    ExtractionLimits,
+    ExtractionReport,
+    iter_pages,
+    set_max_parsers,
+)
+
+__all__ = [
+    "ModelRegistry",
+    "PDF_BACKENDS",
+    "SECTION_PATTERNS",
+    "ExtractedPage",
+    "ExtractedWord",
+    "ExtractionBusy",
+    "ExtractionLimits",
+    "ExtractionReport",
+    "iter_pages",
+    "model_registry",
+    "set_max_parsers",
+]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def content_key(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs ``factory``. Callers that arrive
+    while it is in flight await the same future and get the same result or
+    exception. Nothing is kept once the call finishes, so results are never stale.
+    If the leader is cancelled, a waiting caller takes over as the new leader.
+    Coalescing is per process (per event loop).
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                self._coalesced -= 1
+
+        future = asyncio.get_running_loop().create_future()
+        # Consume the exception so a leader failure with no followers is not logged as unretrieved.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self._leaders += 1
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "executions": self._leaders,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._inflight),
+        }
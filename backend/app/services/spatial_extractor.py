@@ -3,51 +3,89 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-import pdfplumber
-
+from app.config import settings
 from app.schemas import Coordinate, SpatialToken
+from app.services.shared_core import ExtractionLimits, ExtractionReport, iter_pages
+from app.services.spatial_index import SpatialIndex
 
 
 @dataclass
 class ParsedDocument:
     tokens: list[SpatialToken]
     page_sizes: dict[int, tuple[float, float]]
+    layout: SpatialIndex | None = None
+    partial: bool = False
+    partial_reason: str | None = None
 
     @property
     def full_text(self) -> str:
         return " ".join(t.text for t in self.tokens)
 
+    @property
+    def reading_order(self) -> list[int] | range:
+        """Token indices in the order snippets are read: column-aware with layout, else extraction order."""
+        return self.layout.reading_order if self.layout is not None else range(len(self.tokens))
+
 
 class SpatialExtractor:
-    def extract(self, pdf_path: str | Path) -> ParsedDocument:
+    def __init__(self, use_layout: bool = True, limits: ExtractionLimits | None = None) -> None:
+        self.use_layout = use_layout
+        self.limits = limits
+
+    def extract(self, pdf_path: str | Path, backend: str | None = None) -> ParsedDocument:
+        """Parse word boxes within ``limits``; a cut-short document is flagged ``partial``."""
         tokens: list[SpatialToken] = []
         page_sizes: dict[int, tuple[float, float]] = {}
+        report = ExtractionReport()
 
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            for page_index, page in enumerate(pdf.pages, start=1):
-                page_width = float(page.width or 1.0)
-                page_height = float(page.height or 1.0)
-                page_sizes[page_index] = (page_width, page_height)
-                for word in page.extract_words() or []:
-                    text = (word.get("text") or "").strip()
-                    if not text:
-                        continue
-                    tokens.append(
-                        SpatialToken(
-                            text=text,
-                            coordinate=Coordinate(
-                                x0=float(word.get("x0", 0.0)),
-                                y0=float(word.get("top", 0.0)),
-                                x1=float(word.get("x1", 0.0)),
-                                y1=float(word.get("bottom", 0.0)),
-                                page_width=page_width,
-                                page_height=page_height,
-                                page=page_index,
-                            ),
-                        )
+        for page in iter_pages(pdf_path, backend or settings.pdf_backend, self.limits, report):
+            page_index = page.index + 1
+            page_sizes[page_index] = (page.width, page.height)
+            for word in page.words:
+                tokens.append(
+                    SpatialToken(
+                        text=word.text,
+                        coordinate=Coordinate(
+                            x0=word.x0,
+                            y0=word.top,
+                            x1=word.x1,
+                            y1=word.bottom,
+                            page_width=page.width,
+                            page_height=page.height,
+                            page=page_index,
+                        ),
                     )
+                )
+
+        layout = SpatialIndex(tokens, page_sizes) if self.use_layout else None
+        return ParsedDocument(
+            tokens=tokens,
+            page_sizes=page_sizes,
+            layout=layout,
+            partial=report.truncated,
+            partial_reason=report.reason,
+        )
+
+    def section_for(self, parsed: ParsedDocument, index: int) -> str:
+        """Layout heading section when one governs the token, else the vertical band."""
+        if parsed.layout is not None:
+            section = parsed.layout.section(index)
+            if section is not None:
+                return section
+
+        coordinate = parsed.tokens[index].coordinate
+        _, page_height = parsed.page_sizes.get(coordinate.page, (1.0, 1.0))
+        return self.classify_section(coordinate.y0, page_height)
 
-        return ParsedDocument(tokens=tokens, page_sizes=page_sizes)
+    def context_span(self, parsed: ParsedDocument, index: int, window: int) -> tuple[int, int]:
+        """``[start, end)`` of a token's snippet, as positions in ``parsed.reading_order``."""
+        if parsed.layout is not None:
+            return parsed.layout.context_span(index, window)
+        return max(0, index - window), min(len(parsed.tokens), index + window + 1)
+
+    def context_for(self, parsed: ParsedDocument, index: int, window: int) -> str:
+        start, end = self.context_span(parsed, index, window)
+        return " ".join(parsed.tokens[i].text for i in parsed.reading_order[start:end])
 
     @staticmethod
     def classify_section(y0: float, page_height: float) -> str:
@@ -63,3 +101,55 @@ class SpatialExtractor:
         start = max(0, index - window)
         end = min(len(tokens), index + window + 1)
         return " ".join(token.text for token in tokens[start:end])
+
+    def occurrences(
+        self,
+        parsed: ParsedDocument,
+        lowered_tokens: list[str],
+        skill_key: str,
+        window: int,
+        limit: int,
+    ) -> list[int]:
+        """
+        Return token indices where a skill occurs, in reading order.
+
+        Exact matches win over partial (substring) matches. A hit is dropped only
+        when its snippet overlaps the snippet of a kept hit in the same section;
+        snippets are clipped to their layout block, so hits in different blocks or
+        sections are always kept. Beyond ``limit`` the hits are shared out across
+        sections first, then thinned evenly within each section.
+        """
+        hits = [i for i, token in enumerate(lowered_tokens) if token == skill_key]
+        if not hits:
+            hits = [i for i, token in enumerate(lowered_tokens) if skill_key in token]
+        if parsed.layout is not None:
+            hits.sort(key=lambda i: parsed.layout.reading_position[i])
+
+        by_section: dict[str, list[int]] = {}
+        last_end: dict[str, int] = {}
+        for index in hits:
+            start, end = self.context_span(parsed, index, window)
+            section = self.section_for(parsed, index)
+            if start < last_end.get(section, 0):
+                continue
+            last_end[section] = end
+            by_section.setdefault(section, []).append(index)
+
+        groups = list(by_section.values())
+        if limit > 0 and sum(len(group) for group in groups) > limit:
+            quotas = [0] * len(groups)
+            while sum(quotas) < limit:
+                for g, group in enumerate(groups):
+                    if quotas[g] < len(group) and sum(quotas) < limit:
+                        quotas[g] += 1
+            groups = [
+                [group[int(j * len(group) / quota)] for j in range(quota)]
+                for group, quota in zip(groups, quotas)
+            ]
+
+        kept = [index for group in groups for index in group]
+        if parsed.layout is not None:
+            kept.sort(key=lambda i: parsed.layout.reading_position[i])
+        else:
+            kept.sort()
+        return kept
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from app.schemas import SpatialToken
+from app.services.shared_core import SECTION_PATTERNS
+
+
+Box = tuple[float, float, float, float]
+
+
+@dataclass
+class LayoutLine:
+    page: int
+    token_indices: list[int]
+    box: Box
+    heading: str | None = None
+
+
+@dataclass
+class LayoutBlock:
+    page: int
+    line_indices: list[int]
+    box: Box
+    section: str | None = None
+
+
+@dataclass
+class _PageGrid:
+    cell_size: float
+    cells: dict[tuple[int, int], list[int]] = field(default_factory=lambda: defaultdict(list))
+
+    def cell_range(self, box: Box) -> tuple[range, range]:
+        x0, y0, x1, y1 = box
+        return (
+            range(int(x0 // self.cell_size), int(x1 // self.cell_size) + 1),
+            range(int(y0 // self.cell_size), int(y1 // self.cell_size) + 1),
+        )
+
+    def insert(self, index: int, box: Box) -> None:
+        xs, ys = self.cell_range(box)
+        for cx in xs:
+            for cy in ys:
+                self.cells[(cx, cy)].append(index)
+
+
+def _overlaps(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _union(boxes: list[Box]) -> Box:
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+class SpatialIndex:
+    """
+    Per-page uniform grid over token boxes plus the line/block layout built on it.
+
+    Tokens are bucketed into fixed-size grid cells so ``near`` only inspects the
+    cells a query box touches. Lines are split on wide horizontal gaps, so the
+    two columns of a resume never share a line, and lines are merged into blocks
+    through grid lookups instead of an all-pairs scan. Blocks are then put in
+    column-aware reading order, which drives both section detection (short
+    heading lines matched against ``SECTION_PATTERNS``) and context snippets.
+    """
+
+    max_heading_words = 4
+    footer_band = 0.84
+
+    def __init__(
+        self,
+        tokens: list[SpatialToken],
+        page_sizes: dict[int, tuple[float, float]],
+        cell_size: float = 48.0,
+    ) -> None:
+        self.tokens = tokens
+        self.page_sizes = page_sizes
+        self.grids: dict[int, _PageGrid] = {}
+        self.lines: list[LayoutLine] = []
+        self.blocks: list[LayoutBlock] = []
+        self.token_line: list[int] = [0] * len(tokens)
+        self.token_block: list[int] = [0] * len(tokens)
+        self.line_section: list[str | None] = []
+        self.reading_order: list[int] = []
+        self.block_order: list[int] = []
+        self.reading_position: list[int] = [0] * len(tokens)
+
+        by_page: dict[int, list[int]] = defaultdict(list)
+        for i, token in enumerate(tokens):
+            by_page[token.coordinate.page].append(i)
+            grid = self.grids.setdefault(token.coordinate.page, _PageGrid(cell_size))
+            grid.insert(i, self._box(i))
+
+        for page in sorted(by_page):
+            self._build_lines(page, by_page[page])
+        for page in sorted(by_page):
+            self._build_blocks(page)
+        self._order_blocks()
+
+    def _box(self, index: int) -> Box:
+        c = self.tokens[index].coordinate
+        return (c.x0, c.y0, c.x1, c.y1)
+
+    def near(self, page: int, box: Box, margin: float = 0.0) -> list[int]:
+        """Token indices on ``page`` whose boxes intersect ``box`` grown by ``margin``."""
+        grid = self.grids.get(page)
+        if grid is None:
+            return []
+        query = (box[0] - margin, box[1] - margin, box[2] + margin, box[3] + margin)
+        xs, ys = grid.cell_range(query)
+        found: set[int] = set()
+        for cx in xs:
+            for cy in ys:
+                for i in grid.cells.get((cx, cy), ()):
+                    if i not in found and _overlaps(self._box(i), query):
+                        found.add(i)
+        return sorted(found)
+
+    def _build_lines(self, page: int, indices: list[int]) -> None:
+        ordered = sorted(indices, key=lambda i: ((self._box(i)[1] + self._box(i)[3]) / 2, self._box(i)[0]))
+
+        rows: list[list[int]] = []
+        for i in ordered:
+            x0, y0, x1, y1 = self._box(i)
+            center = (y0 + y1) / 2
+            if rows:
+                last = self._box(rows[-1][0])
+                if abs(center - (last[1] + last[3]) / 2) <= max(last[3] - last[1], 1.0) / 2:
+                    rows[-1].append(i)
+                    continue
+            rows.append([i])
+
+        for row in rows:
+            row.sort(key=lambda i: self._box(i)[0])
+            height = statistics.median(self._box(i)[3] - self._box(i)[1] for i in row) or 1.0
+            segment = [row[0]]
+            for i in row[1:]:
+                if self._box(i)[0] - self._box(segment[-1])[2] > 1.5 * height:
+                    self._add_line(page, segment)
+                    segment = []
+                segment.append(i)
+            self._add_line(page, segment)
+
+    def _add_line(self, page: int, token_indices: list[int]) -> None:
+        line_id = len(self.lines)
+        words = [self.tokens[i].text for i in token_indices]
+        heading = None
+        if len(words) <= self.max_heading_words:
+            text = " ".join(words)
+            heading = next(
+                (name for name, pattern in SECTION_PATTERNS.items() if pattern.search(text)),
+                None,
+            )
+        self.lines.append(
+            LayoutLine(
+                page=page,
+                token_indices=token_indices,
+                box=_union([self._box(i) for i in token_indices]),
+                heading=heading,
+            )
+        )
+        for i in token_indices:
+            self.token_line[i] = line_id
+
+    def _build_blocks(self, page: int) -> None:
+        line_ids = [k for k, line in enumerate(self.lines) if line.page == page]
+        parent = {k: k for k in line_ids}
+
+        def find(k: int) -> int:
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        for k in line_ids:
+            line = self.lines[k]
+            x0, _, x1, y1 = line.box
+            gap = max(line.box[3] - line.box[1], 1.0)
+            for i in self.near(page, (x0, y1, x1, y1 + gap)):
+                other = self.token_line[i]
+                if other == k or self.lines[other].box[1] < y1:
+                    continue
+                parent[find(other)] = find(k)
+
+        groups: dict[int, list[int]] = defaultdict(list)
+        for k in line_ids:
+            groups[find(k)].append(k)
+
+        for members in groups.values():
+            members.sort(key=lambda k: (self.lines[k].box[1], self.lines[k].box[0]))
+            self.blocks.append(
+                LayoutBlock(
+                    page=page,
+                    line_indices=members,
+                    box=_union([self.lines[k].box for k in members]),
+                )
+            )
+
+    def _order_blocks(self) -> None:
+        by_page: dict[int, list[int]] = defaultdict(list)
+        for b, block in enumerate(self.blocks):
+            by_page[block.page].append(b)
+
+        # Runs of blocks in reading order (a full-width block, a band above or below
+        # the columns, or one column), flagged when they start a later column.
+        runs: list[tuple[list[int], bool]] = []
+        for page in sorted(by_page):
+            page_width, _ = self.page_sizes.get(page, (1.0, 1.0))
+            pending: list[int] = []
+            for b in sorted(by_page[page], key=lambda b: self.blocks[b].box[1]):
+                box = self.blocks[b].box
+                if box[2] - box[0] >= 0.6 * page_width:
+                    runs.extend(self._columns(pending))
+                    pending = []
+                    runs.append(([b], False))
+                else:
+                    pending.append(b)
+            runs.extend(self._columns(pending))
+
+        self.block_order = [b for run, _ in runs for b in run]
+        self.line_section = [None] * len(self.lines)
+        self.block_span = [(0, 0)] * len(self.blocks)
+        pages_with_headings = {line.page for line in self.lines if line.heading is not None}
+        current: str | None = None
+        page: int | None = None
+        for run, later_column in runs:
+            # A page, or a later column, with its own headings starts unassigned: text
+            # above its first heading must not inherit the section the previous page
+            # or column ended in. Without headings it continues that section.
+            if self.blocks[run[0]].page != page:
+                page = self.blocks[run[0]].page
+                if page in pages_with_headings:
+                    current = None
+            if later_column and any(
+                self.lines[k].heading is not None for b in run for k in self.blocks[b].line_indices
+            ):
+                current = None
+            for b in run:
+                block = self.blocks[b]
+                start = len(self.reading_order)
+                footer = self._is_footer(block)
+                for k in block.line_indices:
+                    line = self.lines[k]
+                    if line.heading is not None:
+                        current = line.heading
+                        footer = False
+                    section = None if footer else current
+                    if block.section is None:
+                        block.section = section
+                    self.line_section[k] = section
+                    for i in line.token_indices:
+                        self.token_block[i] = b
+                        self.reading_position[i] = len(self.reading_order)
+                        self.reading_order.append(i)
+                self.block_span[b] = (start, len(self.reading_order))
+
+    def _is_footer(self, block: LayoutBlock) -> bool:
+        """Blocks in the bottom band of a page (page numbers, disclaimers) do not inherit a section."""
+        _, page_height = self.page_sizes.get(block.page, (1.0, 1.0))
+        return block.box[1] >= self.footer_band * page_height
+
+    def _side_by_side(self, a: int, b: int) -> bool:
+        """Blocks that share vertical extent without overlapping horizontally."""
+        first, second = self.blocks[a].box, self.blocks[b].box
+        return (
+            first[1] <= second[3]
+            and second[1] <= first[3]
+            and (first[2] < second[0] or second[2] < first[0])
+        )
+
+    def _columns(self, block_ids: list[int]) -> list[tuple[list[int], bool]]:
+        """
+        Split narrow blocks into reading runs: the band above the column region,
+        each column top to bottom, then the band below. Runs after the first
+        column are flagged as later columns.
+
+        The column region spans the blocks that have a side-by-side neighbour, so
+        a narrow centred header (name, title, contact line) above a two-column
+        body is read first instead of being sorted into one of the columns.
+        """
+        if not block_ids:
+            return []
+        by_top = sorted(block_ids, key=lambda b: self.blocks[b].box[1])
+        region = [b for b in block_ids if any(self._side_by_side(b, other) for other in block_ids if other != b)]
+        if not region:
+            return [(by_top, False)]
+
+        top = min(self.blocks[b].box[1] for b in region)
+        bottom = max(self.blocks[b].box[3] for b in region)
+        above = [b for b in by_top if self.blocks[b].box[3] <= top]
+        below = [b for b in by_top if self.blocks[b].box[1] >= bottom]
+        inside = [b for b in block_ids if b not in above and b not in below]
+
+        columns: list[tuple[float, list[int]]] = []
+        for b in sorted(inside, key=lambda b: self.blocks[b].box[0]):
+            x0, _, x1, _ = self.blocks[b].box
+            if columns and x0 <= columns[-1][0]:
+                columns[-1] = (max(columns[-1][0], x1), columns[-1][1] + [b])
+            else:
+                columns.append((x1, [b]))
+        runs = [(above, False)]
+        runs += [(sorted(members, key=lambda b: self.blocks[b].box[1]), n > 0) for n, (_, members) in enumerate(columns)]
+        runs.append((below, False))
+        return [(run, later) for run, later in runs if run]
+
+    def section(self, index: int) -> str | None:
+        """Layout section governing a token, or ``None`` before the first heading."""
+        return self.line_section[self.token_line[index]]
+
+    def context_span(self, index: int, window: int) -> tuple[int, int]:
+        """
+        ``[start, end)`` positions in ``reading_order`` of the snippet around a token.
+
+        The window is clipped to the token's block, so a snippet never pulls in text
+        from another column or a different part of the page.
+        """
+        position = self.reading_position[index]
+        block_start, block_end = self.block_span[self.token_block[index]]
+        return max(block_start, position - window), min(block_end, position + window + 1)
+
+    def context(self, index: int, window: int) -> str:
+        """Snippet around a token, following column-aware reading order within its block."""
+        start, end = self.context_span(index, window)
+        return " ".join(self.tokens[i].text for i in self.reading_order[start:end])
+
+    def line_chunks(self, max_tokens: int) -> list[list[int]]:
+        """
+        Group whole lines into chunks of roughly ``max_tokens`` tokens.
+
+        Chunks never cross a block boundary, so a chunk stays inside one column
+        and one page and its tokens share a heading section.
+        """
+        chunks: list[list[int]] = []
+        for b in self.block_order:
+            current: list[int] = []
+            for k in self.blocks[b].line_indices:
+                current.extend(self.lines[k].token_indices)
+                if len(current) >= max_tokens:
+                    chunks.append(current)
+                    current = []
+            if current:
+                chunks.append(current)
+        return chunks
@@ -3,39 +3,31 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Iterable
 
-import pdfplumber
-
 from app.schemas import ParsedDocument, WordBox
+from app.services.shared_core import iter_pages
 
 
 class CoordinateAwareParser:
     """Extract text with geometry so layout can affect confidence scoring."""
 
-    def parse_pdf(self, pdf_path: str | Path) -> ParsedDocument:
+    def parse_pdf(self, pdf_path: str | Path, backend: str = "pdfplumber") -> ParsedDocument:
         words: list[WordBox] = []
         ordered_text: list[str] = []
 
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            for page in pdf.pages:
-                page_height = float(page.height or 1.0)
-                for word in page.extract_words() or []:
-                    token = (word.get("text") or "").strip()
-                    if not token:
-                        continue
-
-                    top = float(word.get("top", 0.0))
-                    section = self._section_from_vertical_position(top, page_height)
-                    words.append(
-                        WordBox(
-                            text=token,
-                            x0=float(word.get("x0", 0.0)),
-                            x1=float(word.get("x1", 0.0)),
-                            top=top,
-                            bottom=float(word.get("bottom", top)),
-                            section=section,
-                        )
+        for page in iter_pages(pdf_path, backend):
+            for word in page.words:
+                section = self._section_from_vertical_position(word.top, page.height)
+                words.append(
+                    WordBox(
+                        text=word.text,
+                        x0=word.x0,
+                        x1=word.x1,
+                        top=word.top,
+                        bottom=word.bottom,
+                        section=section,
                     )
-                    ordered_text.append(token)
+                )
+                ordered_text.append(word.text)
 
         return ParsedDocument(words=words, full_text=" ".join(ordered_text))
 
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+EMBEDDINGS_FILE = "embeddings.npy"
+SCALES_FILE = "scales.npy"
+META_FILE = "taxonomy.json"
+
+
+def load_taxonomy(path: str | Path) -> list[str]:
+    """Read skill names from a .txt (one per line), .json (list) or .csv (first column)."""
+    path = Path(path)
+    if path.suffix == ".json":
+        names = json.loads(path.read_text(encoding="utf-8"))
+    elif path.suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            names = [row[0] for row in csv.reader(f) if row]
+    else:
+        names = path.read_text(encoding="utf-8").splitlines()
+    return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+
+def build_taxonomy_index(
+    skills: list[str],
+    output_dir: str | Path,
+    encode_fn: Callable[[list[str]], np.ndarray],
+    model_name: str,
+    dtype: str = "float16",
+    batch_size: int = 512,
+) -> Path:
+    """
+    Embed a skill taxonomy offline and persist it for memory-mapped serving.
+
+    ``float16`` stores normalized embeddings directly. ``int8`` stores symmetric
+    per-row quantized values plus a float32 scale per row.
+    """
+    if dtype not in {"float16", "int8"}:
+        raise ValueError("dtype must be 'float16' or 'int8'.")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    blocks = [
+        np.asarray(encode_fn(skills[start : start + batch_size]), dtype=np.float32)
+        for start in range(0, len(skills), batch_size)
+    ]
+    embeddings = np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = embeddings / np.maximum(norms, 1e-12)
+
+    if dtype == "int8":
+        scales = np.maximum(np.abs(embeddings).max(axis=1), 1e-12) / 127.0
+        quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+        np.save(output_dir / EMBEDDINGS_FILE, quantized)
+        np.save(output_dir / SCALES_FILE, scales.astype(np.float32))
+    else:
+        np.save(output_dir / EMBEDDINGS_FILE, embeddings.astype(np.float16))
+
+    meta = {
+        "model_name": model_name,
+        "dtype": dtype,
+        "count": len(skills),
+        "dim": int(embeddings.shape[1]) if embeddings.size else 0,
+        "skills": skills,
+    }
+    (output_dir / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    return output_dir
+
+
+class TaxonomyIndexMismatch(ValueError):
+    """The index was embedded with a different model (or dimension) than the one serving queries."""
+
+
+class TaxonomyIndex:
+    """
+    Lazily memory-mapped taxonomy embedding matrix.
+
+    Nothing is read until the first search; the matrix is then opened with
+    ``np.load(mmap_mode="r")`` so forked workers share the OS page cache instead
+    of each holding a private copy. Similarity is computed in row blocks so only
+    one dequantized block is resident at a time.
+
+    With ``model_name`` set, loading fails with ``TaxonomyIndexMismatch`` if the
+    index was built with another model. Query embeddings of the wrong dimension
+    are rejected the same way.
+    """
+
+    def __init__(self, index_dir: str | Path, block_size: int = 4096, model_name: str | None = None) -> None:
+        self.index_dir = Path(index_dir)
+        self.block_size = max(1, block_size)
+        self.expected_model = model_name
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.skills: list[str] = []
+        self.model_name = ""
+        self.dtype = "float16"
+        self.dim = 0
+        self._embeddings: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            meta = json.loads((self.index_dir / META_FILE).read_text(encoding="utf-8"))
+            if self.expected_model and meta["model_name"] != self.expected_model:
+                raise TaxonomyIndexMismatch(
+                    f"Taxonomy index {self.index_dir} was built with '{meta['model_name']}' but the serving "
+                    f"model is '{self.expected_model}'. Rebuild it with build_taxonomy_index.py."
+                )
+            self.dim = int(meta["dim"])
+            self.skills = meta["skills"]
+            self.model_name = meta["model_name"]
+            self.dtype = meta["dtype"]
+            self._embeddings = np.load(self.index_dir / EMBEDDINGS_FILE, mmap_mode="r")
+            if self.dtype == "int8":
+                self._scales = np.load(self.index_dir / SCALES_FILE, mmap_mode="r")
+            self._loaded = True
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self.skills)
+
+    def search(
+        self,
+        chunk_embeddings: np.ndarray,
+        min_similarity: float,
+        k: int,
+    ) -> list[tuple[int, int, float]]:
+        """
+        Best-matching chunk for every taxonomy skill, keeping the top ``k`` skills.
+
+        Returns ``(skill_id, chunk_id, similarity)`` tuples sorted best first, with
+        similarity mapped to [0, 1] like ``ContextualVerifier.similarity``.
+        """
+        self._load()
+        chunks = np.asarray(chunk_embeddings, dtype=np.float32)
+        if not len(self.skills) or not len(chunks):
+            return []
+        if chunks.shape[1] != self.dim:
+            raise TaxonomyIndexMismatch(
+                f"Taxonomy index {self.index_dir} has {self.dim}-dim embeddings but queries are "
+                f"{chunks.shape[1]}-dim. Rebuild it with build_taxonomy_index.py."
+            )
+
+        skill_ids: list[np.ndarray] = []
+        chunk_ids: list[np.ndarray] = []
+        scores: list[np.ndarray] = []
+        for start in range(0, len(self.skills), self.block_size):
+            block = np.asarray(self._embeddings[start : start + self.block_size], dtype=np.float32)
+            if self._scales is not None:
+                block *= np.asarray(self._scales[start : start + self.block_size])[:, None]
+
+            sims = (block @ chunks.T + 1.0) / 2.0
+            best_chunk = sims.argmax(axis=1)
+            best = sims[np.arange(len(sims)), best_chunk]
+            keep = np.nonzero(best >= min_similarity)[0]
+            if len(keep) > k:
+                keep = keep[np.argpartition(-best[keep], k - 1)[:k]]
+
+            skill_ids.append(keep + start)
+            chunk_ids.append(best_chunk[keep])
+            scores.append(best[keep])
+
+        all_skills = np.concatenate(skill_ids)
+        all_chunks = np.concatenate(chunk_ids)
+        all_scores = np.concatenate(scores)
+        if len(all_scores) > k:
+            top = np.argpartition(-all_scores, k - 1)[:k]
+            all_skills, all_chunks, all_scores = all_skills[top], all_chunks[top], all_scores[top]
+
+        order = np.argsort(-all_scores, kind="stable")
+        return [
+            (int(all_skills[i]), int(all_chunks[i]), float(min(1.0, all_scores[i])))
+            for i in order
+        ]
@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Iterable
 
 from app.schemas import SkillEvidence, WordBox
+from app.services.lexical_scorer import LexicalStats, bm25_pair_scores
+from app.services.shared_core import model_registry
 
 try:
     import torch
@@ -16,19 +18,40 @@ except Exception:  # pragma: no cover
 class SemanticVerifier:
     """Cross-encoder style verifier for skill-context grounding."""
 
-    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2") -> None:
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        lexical_stats: LexicalStats | None = None,
+    ) -> None:
         self.model_name = model_name
+        self.lexical_stats = lexical_stats
         self.tokenizer = None
         self.model = None
         if AutoTokenizer and AutoModelForSequenceClassification:
             try:
-                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
-                self.model.eval()
+                self.tokenizer, self.model = model_registry.acquire(
+                    "cross-encoder",
+                    model_name,
+                    lambda: self._load(model_name),
+                )
             except Exception:
                 self.tokenizer = None
                 self.model = None
 
+    @staticmethod
+    def _load(model_name: str):
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+        return tokenizer, model
+
+    def close(self) -> None:
+        """Return the shared model to the registry; it stays cached until evicted."""
+        if self.model is not None:
+            model_registry.release("cross-encoder", self.model_name)
+            self.tokenizer = None
+            self.model = None
+
     def semantic_proof(self, skill: str, context: str) -> float:
         if self.tokenizer is None or self.model is None or torch is None:
             return self._fallback_similarity(skill, context)
@@ -45,14 +68,33 @@ class SemanticVerifier:
             score = torch.sigmoid(logits.squeeze()).item()
             return float(max(0.0, min(1.0, score)))
 
-    @staticmethod
-    def _fallback_similarity(skill: str, context: str) -> float:
-        skill_tokens = set(skill.lower().split())
-        context_tokens = set(context.lower().split())
-        if not skill_tokens:
-            return 0.0
-        overlap = len(skill_tokens & context_tokens) / len(skill_tokens)
-        return float(max(0.05, min(1.0, overlap)))
+    def semantic_proofs(self, pairs: list[tuple[str, str]], batch_size: int = 32) -> list[float]:
+        """Batched ``semantic_proof`` over many (skill, context) pairs."""
+        if not pairs:
+            return []
+
+        if self.tokenizer is None or self.model is None or torch is None:
+            return bm25_pair_scores(pairs, self.lexical_stats)
+
+        scores: list[float] = []
+        with torch.no_grad():
+            for start in range(0, len(pairs), batch_size):
+                chunk = pairs[start : start + batch_size]
+                encoded = self.tokenizer(
+                    [skill for skill, _ in chunk],
+                    [context for _, context in chunk],
+                    truncation=True,
+                    max_length=256,
+                    padding=True,
+                    return_tensors="pt",
+                )
+                logits = self.model(**encoded).logits
+                probs = torch.sigmoid(logits.view(len(chunk), -1)[:, 0])
+                scores.extend(float(max(0.0, min(1.0, p))) for p in probs.tolist())
+        return scores
+
+    def _fallback_similarity(self, skill: str, context: str) -> float:
+        return bm25_pair_scores([(skill, context)], self.lexical_stats)[0]
 
     def build_evidence(
         self,
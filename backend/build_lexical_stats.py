@@ -0,0 +1,49 @@
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+from app.config import settings
+from app.services.lexical_scorer import LexicalStats
+from app.services.taxonomy_index import load_taxonomy
+
+RESUME_COLUMNS = ["Resume", "resume", "Resume_str", "text", "Text", "cleaned_resume"]
+
+
+def iter_corpus(path: str):
+    """Token lists from a processed .jsonl ("tokens" or "text"), a .csv (resume column) or a directory of .txt files."""
+    path = Path(path)
+    if path.is_dir():
+        for file in sorted(path.rglob("*.txt")):
+            yield file.read_text(encoding="utf-8", errors="ignore").split()
+    elif path.suffix == ".jsonl":
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["tokens"] if "tokens" in record else str(record.get("text", "")).split()
+    else:
+        csv.field_size_limit(sys.maxsize)
+        with path.open(newline="", encoding="utf-8", errors="ignore") as f:
+            reader = csv.DictReader(f)
+            column = next((c for c in RESUME_COLUMNS if c in (reader.fieldnames or [])), (reader.fieldnames or [""])[0])
+            for row in reader:
+                yield str(row.get(column) or "").split()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute BM25 context profiles for the lexical similarity backend.")
+    parser.add_argument("corpus", help="Resume corpus: processed .jsonl, .csv or a directory of .txt files")
+    parser.add_argument("taxonomy", help="Skill list: .txt (one per line), .json (list) or .csv (first column)")
+    parser.add_argument("--output", default=settings.bm25_stats_path or "data/lexical_stats.json")
+    parser.add_argument("--window", type=int, default=settings.context_window_size)
+    parser.add_argument("--profile_size", type=int, default=64)
+    parser.add_argument("--min_mentions", type=int, default=5)
+    args = parser.parse_args()
+
+    skills = load_taxonomy(args.taxonomy)
+    stats = LexicalStats.build(iter_corpus(args.corpus), skills, args.window, args.profile_size, args.min_mentions)
+    out = stats.save(args.output)
+    profiled = sum(1 for key in stats.profiles if key)
+    print(f"Profiled {profiled} of {len(skills)} skills over {stats.documents} resumes into {out}")
@@ -0,0 +1,23 @@
+import argparse
+
+from app.config import settings
+from app.services.contextual_verifier import ContextualVerifier
+from app.services.taxonomy_index import build_taxonomy_index, load_taxonomy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed a skill taxonomy into a memory-mappable index.")
+    parser.add_argument("taxonomy", help="Skill list: .txt (one per line), .json (list) or .csv (first column)")
+    parser.add_argument("--output_dir", default=settings.taxonomy_index_path or "data/taxonomy_index")
+    parser.add_argument("--model_name", default=settings.semantic_model_name)
+    parser.add_argument("--dtype", default="float16", choices=["float16", "int8"])
+    parser.add_argument("--batch_size", type=int, default=512)
+    args = parser.parse_args()
+
+    verifier = ContextualVerifier(args.model_name)
+    if verifier.model is None:
+        raise SystemExit(f"Could not load embedding model '{args.model_name}'.")
+
+    skills = load_taxonomy(args.taxonomy)
+    out = build_taxonomy_index(skills, args.output_dir, verifier.encode, args.model_name, args.dtype, args.batch_size)
+    print(f"Indexed {len(skills)} skills into {out}")
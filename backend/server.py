@@ -1,4 +1,76 @@
+import argparse
+import gc
+import os
+
 import uvicorn
 
+from app.config import settings
+
+
+def worker_thread_count(workers: int) -> int:
+    """Intra-op threads per worker so that workers together do not oversubscribe cores."""
+    if settings.worker_torch_threads > 0:
+        return settings.worker_torch_threads
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def run_production(host: str, port: int, workers: int) -> None:
+    """
+    Pre-fork launcher: the app (and therefore every model it instantiates) is
+    imported once in the master, then workers are forked from it so weight
+    pages stay shared copy-on-write instead of being loaded N times.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    threads = worker_thread_count(workers)
+
+    def post_fork(server, worker):
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        os.environ["MKL_NUM_THREADS"] = str(threads)
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except Exception:
+            pass
+
+    class PreforkApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
+                "max_requests": settings.worker_max_requests,
+                "max_requests_jitter": settings.worker_max_requests_jitter,
+                "timeout": settings.worker_timeout,
+                "post_fork": post_fork,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+
+            # Move everything allocated while loading models into the permanent
+            # generation so the cyclic GC in workers does not touch (and thereby
+            # un-share) those pages.
+            gc.collect()
+            gc.freeze()
+            return app
+
+    PreforkApplication().run()
+
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--production", action="store_true")
+    parser.add_argument("--workers", type=int, default=settings.server_workers)
+    args = parser.parse_args()
+
+    if args.production:
+        run_production(args.host, args.port, args.workers)
+    else:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, reload=True)
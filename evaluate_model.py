@@ -1,8 +1,30 @@
+import argparse
+import copy
 import json
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
 
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+from transformers import AutoTokenizer
 
-def main():
+from src.dl_models.export import export_torchscript, load_torchscript
+from src.dl_models.skill_classifier import SkillExtractModel
+from src.pipeline.dataset_builder import load_jsonl
+from src.pipeline.preprocess import build_bio_labels
+from src.spatial_engine.pdf_parser import BBOX_SCALE, extract_pdf_tokens
+from train_skill_extract_model import ResumeDataset
+
+CONFIGS = ("fp32", "quantized", "scripted")
+
+
+def show_training_metrics():
     metrics_path = Path("models/training_metrics.json")
     if not metrics_path.exists():
         raise FileNotFoundError("models/training_metrics.json not found. Run training first.")
@@ -12,5 +34,247 @@ def main():
         print(f"- {k}: {v}")
 
 
+def load_records(data: str, max_docs: int | None = None) -> List[Dict]:
+    """Held-out JSONL records, or PDFs from a directory with lexicon-derived (silver) BIO labels."""
+    path = Path(data)
+    if path.is_dir():
+        records = []
+        for pdf in sorted(path.rglob("*.pdf"))[:max_docs]:
+            pdf_tokens = extract_pdf_tokens(str(pdf), scale=BBOX_SCALE)
+            tokens = [t["text"] for t in pdf_tokens]
+            records.append(
+                {
+                    "tokens": tokens,
+                    "bbox": [t["bbox"] for t in pdf_tokens],
+                    "section": ["other"] * len(tokens),
+                    "labels": build_bio_labels(tokens),
+                }
+            )
+        return records
+    records = load_jsonl(str(path))
+    return records[:max_docs] if max_docs else records
+
+
+def bio_spans(tags: List[int]) -> Set[Tuple[int, int]]:
+    """(start, end) spans from a B=1 / I=2 / O=0 tag sequence; stray I- tags open a span."""
+    spans, start = set(), None
+    for i, tag in enumerate(tags + [0]):
+        if tag == 1 or (tag == 2 and start is None) or tag == 0:
+            if start is not None:
+                spans.add((start, i))
+                start = None
+            if tag in (1, 2):
+                start = i
+    return spans
+
+
+def build_runner(config: str, model: SkillExtractModel, args) -> Callable:
+    """Callable ``(input_ids, attention_mask, bbox, section_ids) -> tag tensor`` for one configuration."""
+    if config == "fp32":
+        return lambda ids, mask, bbox, sec: model.predict(ids, mask, bbox, sec, with_section=False)["token_predictions"]
+
+    if config == "quantized":
+        quantized = torch.ao.quantization.quantize_dynamic(copy.deepcopy(model), {nn.Linear}, dtype=torch.qint8)
+        quantized.eval()
+        return lambda ids, mask, bbox, sec: quantized.predict(ids, mask, bbox, sec, with_section=False)["token_predictions"]
+
+    if config == "scripted":
+        path = args.scripted_model_path
+        if not path:
+            path = str(Path(tempfile.mkdtemp()) / "skill_extract_model.ts")
+            export_torchscript(model, path, args.max_length, with_section=False)
+        graph = load_torchscript(path)
+
+        def run(ids, mask, bbox, sec):
+            with torch.no_grad():
+                return graph(ids, mask, bbox, sec)[0]
+
+        return run
+
+    raise ValueError(f"Unknown configuration '{config}'. Choose from: {', '.join(CONFIGS)}")
+
+
+def run_config(runner: Callable, dataset: ResumeDataset, batch_size: int, warmup: int = 1) -> Dict:
+    loader = DataLoader(dataset, batch_size=batch_size)
+    batches = list(loader)
+    for batch in batches[:warmup]:
+        runner(batch["input_ids"], batch["attention_mask"], batch["bbox"], batch["section_ids"])
+
+    tp = fp_spans = fn = 0
+    fp_tokens = tn_tokens = 0
+    n_docs = n_tokens = 0
+    elapsed = 0.0
+    doc_latencies: List[float] = []
+    for batch in batches:
+        start = time.perf_counter()
+        tags = runner(batch["input_ids"], batch["attention_mask"], batch["bbox"], batch["section_ids"])
+        seconds = time.perf_counter() - start
+        elapsed += seconds
+
+        size = batch["input_ids"].shape[0]
+        doc_latencies.extend([seconds] * size)
+        n_docs += size
+        n_tokens += int(batch["attention_mask"].sum())
+
+        labels = batch["labels"]
+        for i in range(size):
+            length = int(batch["attention_mask"][i].sum())
+            gold = labels[i, 1 : length - 1].tolist()
+            pred = tags[i, 1 : length - 1].tolist()
+            gold_spans, pred_spans = bio_spans(gold), bio_spans(pred)
+            tp += len(gold_spans & pred_spans)
+            fp_spans += len(pred_spans - gold_spans)
+            fn += len(gold_spans - pred_spans)
+            gold_np, pred_np = np.array(gold), np.array(pred)
+            fp_tokens += int(((gold_np == 0) & (pred_np != 0)).sum())
+            tn_tokens += int(((gold_np == 0) & (pred_np == 0)).sum())
+
+    precision = tp / max(tp + fp_spans, 1)
+    recall = tp / max(tp + fn, 1)
+    return {
+        "span_precision": precision,
+        "span_recall": recall,
+        "span_f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "false_positive_rate": fp_tokens / max(fp_tokens + tn_tokens, 1),
+        "documents_per_second": n_docs / elapsed if elapsed else 0.0,
+        "tokens_per_second": n_tokens / elapsed if elapsed else 0.0,
+        "p95_document_latency_ms": float(np.percentile(doc_latencies, 95) * 1000) if doc_latencies else 0.0,
+        "documents": n_docs,
+    }
+
+
+def run_settings(args, documents: int) -> Dict:
+    """Inputs that must match for two reports' numbers to be comparable."""
+    return {
+        "model_path": args.model_path,
+        "data": args.data,
+        "documents": documents,
+        "max_length": args.max_length,
+        "threads": torch.get_num_threads(),
+    }
+
+
+def previous_report(report_dir: Path, settings: Dict) -> Tuple[int, Dict | None]:
+    """Latest report version, and the most recent report that was run with the same ``settings``."""
+    reports = sorted(report_dir.glob("eval_report_v*.json"))
+    if not reports:
+        return 0, None
+    version = int(reports[-1].stem.rsplit("v", 1)[-1])
+    for path in reversed(reports):
+        report = json.loads(path.read_text(encoding="utf-8"))
+        if report.get("settings") == settings:
+            return version, report
+    return version, None
+
+
+def compare(current: List[Dict], previous: Dict | None, speed_tolerance: float, f1_tolerance: float) -> List[Dict]:
+    """Per-configuration deltas against the previous report, flagging slowdowns and accuracy drops."""
+    if previous is None:
+        return []
+    before = {(r["config"], r["batch_size"]): r for r in previous.get("results", [])}
+    deltas = []
+    for row in current:
+        old = before.get((row["config"], row["batch_size"]))
+        if old is None:
+            continue
+        speed_ratio = row["tokens_per_second"] / old["tokens_per_second"] if old["tokens_per_second"] else 1.0
+        latency_ratio = (
+            row["p95_document_latency_ms"] / old["p95_document_latency_ms"] if old["p95_document_latency_ms"] else 1.0
+        )
+        f1_delta = row["span_f1"] - old["span_f1"]
+        deltas.append(
+            {
+                "config": row["config"],
+                "batch_size": row["batch_size"],
+                "tokens_per_second_ratio": speed_ratio,
+                "p95_latency_ratio": latency_ratio,
+                "span_f1_delta": f1_delta,
+                "regression": speed_ratio < 1.0 - speed_tolerance
+                or latency_ratio > 1.0 + speed_tolerance
+                or f1_delta < -f1_tolerance,
+            }
+        )
+    return deltas
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(args):
+    if not args.data:
+        show_training_metrics()
+        return
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer_path)
+    model = SkillExtractModel(base_model=args.base_model, num_layers=args.num_layers)
+    model.load_state_dict(torch.load(args.model_path, map_location="cpu"))
+    model.eval()
+
+    dataset = ResumeDataset(load_records(args.data, args.max_docs), tokenizer, args.max_length)
+
+    results = []
+    for config in args.configs.split(","):
+        runner = build_runner(config.strip(), model, args)
+        for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+            row = {"config": config.strip(), "batch_size": batch_size, **run_config(runner, dataset, batch_size)}
+            results.append(row)
+            print(
+                f"{row['config']:>9} bs={batch_size:<3} f1={row['span_f1']:.4f} fpr={row['false_positive_rate']:.4f} "
+                f"docs/s={row['documents_per_second']:.2f} tok/s={row['tokens_per_second']:.0f} "
+                f"p95={row['p95_document_latency_ms']:.1f}ms"
+            )
+
+    report_dir = Path(args.report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    settings = run_settings(args, len(dataset))
+    version, previous = previous_report(report_dir, settings)
+    if version and previous is None:
+        print("No earlier report with the same model, data, max_length and threads; skipping comparison.")
+    deltas = compare(results, previous, args.speed_tolerance, args.f1_tolerance)
+    report = {
+        "version": version + 1,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "settings": settings,
+        "results": results,
+        "compared_to_version": previous["version"] if previous else None,
+        "comparison": deltas,
+    }
+    out = report_dir / f"eval_report_v{version + 1:04d}.json"
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report written to {out}")
+
+    regressions = [d for d in deltas if d["regression"]]
+    for d in regressions:
+        print(
+            f"REGRESSION {d['config']} bs={d['batch_size']}: tok/s x{d['tokens_per_second_ratio']:.2f}, "
+            f"p95 x{d['p95_latency_ratio']:.2f}, f1 {d['span_f1_delta']:+.4f}"
+        )
+    if regressions and args.fail_on_regression:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Accuracy and throughput regression harness for SkillExtractModel.")
+    parser.add_argument("--data", type=str, default=None, help="Held-out JSONL or a directory of PDFs (omit to print training metrics)")
+    parser.add_argument("--model_path", type=str, default="models/skill_extract_model.pt")
+    parser.add_argument("--tokenizer_path", type=str, default="models/tokenizer")
+    parser.add_argument("--base_model", type=str, default="distilbert-base-uncased")
+    parser.add_argument("--num_layers", type=int, default=None)
+    parser.add_argument("--scripted_model_path", type=str, default=None)
+    parser.add_argument("--configs", type=str, default=",".join(CONFIGS))
+    parser.add_argument("--batch_sizes", type=str, default="1,8,32")
+    parser.add_argument("--max_length", type=int, default=256)
+    parser.add_argument("--max_docs", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--report_dir", type=str, default="models/eval_reports")
+    parser.add_argument("--speed_tolerance", type=float, default=0.10, help="Allowed relative throughput/latency slowdown")
+    parser.add_argument("--f1_tolerance", type=float, default=0.01, help="Allowed absolute span-F1 drop")
+    parser.add_argument("--fail_on_regression", action="store_true")
+    main(parser.parse_args())
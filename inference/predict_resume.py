@@ -4,11 +4,13 @@ import json
 import torch
 from transformers import AutoTokenizer
 
+from src.dl_models.export import load_torchscript
+from src.dl_models.registry import model_registry
 from src.dl_models.skill_classifier import SkillExtractModel
 from src.pipeline.preprocess import SPATIAL_WEIGHTS
 from src.semantic_engine.embedding_model import ContextualEmbeddingModel
 from src.spatial_engine.coordinate_mapper import integrity_score, section_to_weight
-from src.spatial_engine.pdf_parser import extract_pdf_tokens
+from src.spatial_engine.pdf_parser import BBOX_SCALE, extract_pdf_tokens
 
 ID_TO_LABEL = {0: "O", 1: "B-SKILL", 2: "I-SKILL"}
 ID_TO_SECTION = {0: "experience", 1: "skills", 2: "projects", 3: "education", 4: "hobbies", 5: "other"}
@@ -20,15 +22,53 @@ def build_context(tokens, idx, window_size=20):
     return " ".join(tokens[left:right])
 
 
-def predict(pdf_path: str, model_path: str = "models/skill_extract_model.pt", tokenizer_path: str = "models/tokenizer"):
-    pdf_tokens = extract_pdf_tokens(pdf_path)
+def load_checkpoint(model_path: str, num_layers: int | None = None) -> SkillExtractModel:
+    model = SkillExtractModel(num_layers=num_layers)
+    model.load_state_dict(torch.load(model_path, map_location="cpu"))
+    model.eval()
+    return model
+
+
+def load_tagger(model_path: str = "models/skill_extract_model.pt", scripted_model_path: str | None = None,
+                num_layers: int | None = None):
+    """Return a callable ``(input_ids, attention_mask, bbox, section_ids) -> (tags, section_logits)``."""
+    if scripted_model_path:
+        graph = model_registry.acquire("torchscript", scripted_model_path, lambda: load_torchscript(scripted_model_path))
+
+        def run(input_ids, attention_mask, bbox, section_ids):
+            with torch.no_grad():
+                tags, _, section_logits = graph(input_ids, attention_mask, bbox, section_ids)
+            return tags, section_logits
+
+        return run
+
+    model = model_registry.acquire("skill-extract", model_path, lambda: load_checkpoint(model_path, num_layers), num_layers)
+
+    def run(input_ids, attention_mask, bbox, section_ids):
+        out = model.predict(input_ids=input_ids, attention_mask=attention_mask, bbox=bbox, section_ids=section_ids)
+        return out["token_predictions"], out["section_logits"]
+
+    return run
+
+
+def release_tagger(model_path: str = "models/skill_extract_model.pt", scripted_model_path: str | None = None,
+                   num_layers: int | None = None):
+    """Drop the reference taken by ``load_tagger``; the model stays cached until evicted."""
+    if scripted_model_path:
+        model_registry.release("torchscript", scripted_model_path)
+    else:
+        model_registry.release("skill-extract", model_path, num_layers)
+
+
+def predict(pdf_path: str, model_path: str = "models/skill_extract_model.pt", tokenizer_path: str = "models/tokenizer",
+            pdf_backend: str = "pdfplumber", scripted_model_path: str | None = None, num_layers: int | None = None):
+    # Same page-normalized box scale as the training data.
+    pdf_tokens = extract_pdf_tokens(pdf_path, backend=pdf_backend, scale=BBOX_SCALE)
     tokens = [t["text"] for t in pdf_tokens]
     bboxes = [t["bbox"] for t in pdf_tokens]
 
     tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
-    model = SkillExtractModel()
-    model.load_state_dict(torch.load(model_path, map_location="cpu"))
-    model.eval()
+    tagger = load_tagger(model_path, scripted_model_path, num_layers)
 
     enc = tokenizer(tokens[:254], is_split_into_words=True, return_tensors="pt", truncation=True, max_length=256)
     effective_len = int(enc["attention_mask"][0].sum())
@@ -42,15 +82,11 @@ def predict(pdf_path: str, model_path: str = "models/skill_extract_model.pt", to
     if bbox_slice:
         bbox_tensor[0, 1 : 1 + len(bbox_slice)] = torch.tensor(bbox_slice, dtype=torch.float)
 
-    with torch.no_grad():
-        out = model(input_ids=input_ids, attention_mask=attention_mask, bbox=bbox_tensor, section_ids=sec_tensor)
-
-    if isinstance(out["token_predictions"], list):
-        pred = out["token_predictions"][0]
-    else:
-        pred = out["token_predictions"][0].tolist()
+    tags, section_logits = tagger(input_ids, attention_mask, bbox_tensor, sec_tensor)
+    release_tagger(model_path, scripted_model_path, num_layers)
+    pred = tags[0].tolist()
 
-    section = ID_TO_SECTION[out["section_logits"].argmax(-1).item()]
+    section = ID_TO_SECTION[section_logits.argmax(-1).item()] if section_logits.numel() else "other"
     embedder = ContextualEmbeddingModel()
 
     results = []
@@ -71,6 +107,7 @@ def predict(pdf_path: str, model_path: str = "models/skill_extract_model.pt", to
                     "context_snippet": context,
                 }
             )
+    embedder.close()
 
     return {"skills": results, "integrity_formula": "IntegrityScore = W_spatial × V_semantic"}
 
@@ -80,5 +117,10 @@ if __name__ == "__main__":
     parser.add_argument("resume_pdf", type=str)
     parser.add_argument("--model_path", default="models/skill_extract_model.pt")
     parser.add_argument("--tokenizer_path", default="models/tokenizer")
+    parser.add_argument("--pdf_backend", default="pdfplumber", choices=["pdfplumber", "pdfium"])
+    parser.add_argument("--scripted_model_path", default=None,
+                        help="TorchScript graph from `python -m src.dl_models.export`; used instead of --model_path")
+    parser.add_argument("--num_layers", type=int, default=None, help="Backbone depth of a distilled student checkpoint")
     args = parser.parse_args()
-    print(json.dumps(predict(args.resume_pdf, args.model_path, args.tokenizer_path), indent=2))
+    print(json.dumps(predict(args.resume_pdf, args.model_path, args.tokenizer_path, args.pdf_backend,
+                             args.scripted_model_path, args.num_layers), indent=2))
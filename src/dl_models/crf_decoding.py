@@ -0,0 +1,40 @@
+from typing import List
+
+import torch
+
+
+def viterbi_decode(
+    emissions: torch.Tensor,
+    mask: torch.Tensor,
+    start_transitions: torch.Tensor,
+    end_transitions: torch.Tensor,
+    transitions: torch.Tensor,
+) -> torch.Tensor:
+    """Batched Viterbi decode with learned CRF transitions.
+
+    Equivalent to ``torchcrf.CRF.decode`` but vectorized over the batch and tag
+    dimensions, so the only Python loop is over time steps. Returns a padded
+    ``(batch, seq_len)`` tensor; positions outside ``mask`` are 0.
+    Requires ``mask[:, 0]`` to be set for every sequence, as torchcrf does.
+    """
+    batch_size, seq_len, _ = emissions.shape
+    mask = mask.bool()
+
+    score = start_transitions.unsqueeze(0) + emissions[:, 0]
+    history: List[torch.Tensor] = []
+    for t in range(1, seq_len):
+        candidates = score.unsqueeze(2) + transitions.unsqueeze(0) + emissions[:, t].unsqueeze(1)
+        best_score, best_prev = candidates.max(dim=1)
+        score = torch.where(mask[:, t].unsqueeze(1), best_score, score)
+        history.append(best_prev)
+    score = score + end_transitions.unsqueeze(0)
+
+    seq_ends = mask.long().sum(dim=1) - 1
+    current = score.argmax(dim=1)
+    tags = torch.zeros((batch_size, seq_len), dtype=torch.long, device=emissions.device)
+    tags.scatter_(1, seq_ends.unsqueeze(1), current.unsqueeze(1))
+    for t in range(seq_len - 2, -1, -1):
+        previous = history[t].gather(1, current.unsqueeze(1)).squeeze(1)
+        current = torch.where(seq_ends > t, previous, current)
+        tags[:, t] = torch.where(seq_ends >= t, current, torch.zeros_like(current))
+    return tags
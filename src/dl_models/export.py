@@ -0,0 +1,140 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Tuple
+
+import torch
+import torch.nn as nn
+
+from src.dl_models.crf_decoding import viterbi_decode
+from src.dl_models.skill_classifier import SkillExtractModel
+
+
+class _EmissionCore(nn.Module):
+    """Encoder + heads with tensor-only outputs, suitable for ``torch.jit.trace``."""
+
+    def __init__(self, model: SkillExtractModel, with_section: bool = True):
+        super().__init__()
+        self.encoder = model.encoder
+        self.tag_head = model.tag_head
+        self.section_head = model.section_head
+        self.with_section = with_section
+
+    def forward(self, input_ids, attention_mask, bbox, section_ids):
+        out = self.encoder(input_ids=input_ids, attention_mask=attention_mask, bbox=bbox, section_ids=section_ids)
+        emissions = self.tag_head(out.sequence_output)
+        if self.with_section:
+            section_logits = self.section_head(out.pooled_output)
+        else:
+            section_logits = emissions.new_zeros((emissions.size(0), 0))
+        return emissions, section_logits
+
+
+class SkillTaggerGraph(nn.Module):
+    """Traced emission core plus scripted batched Viterbi over the learned CRF transitions."""
+
+    def __init__(self, core: nn.Module, model: SkillExtractModel):
+        super().__init__()
+        self.core = core
+        self.use_crf = bool(model.use_crf)
+        num_tags = model.tag_head.out_features
+        if model.use_crf:
+            start, end, transitions = model.crf.start_transitions, model.crf.end_transitions, model.crf.transitions
+        else:
+            start, end, transitions = torch.zeros(num_tags), torch.zeros(num_tags), torch.zeros(num_tags, num_tags)
+        self.register_buffer("start_transitions", start.detach().clone())
+        self.register_buffer("end_transitions", end.detach().clone())
+        self.register_buffer("transitions", transitions.detach().clone())
+
+    def forward(self, input_ids, attention_mask, bbox, section_ids) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        emissions, section_logits = self.core(input_ids, attention_mask, bbox, section_ids)
+        if self.use_crf:
+            tags = viterbi_decode(emissions, attention_mask, self.start_transitions, self.end_transitions, self.transitions)
+        else:
+            tags = emissions.argmax(-1)
+        return tags, emissions, section_logits
+
+
+def example_inputs(model: SkillExtractModel, batch_size: int = 2, max_length: int = 256, seed: int = 0) -> Dict[str, torch.Tensor]:
+    """Random but valid inputs with ragged lengths, used for tracing and parity checks."""
+    generator = torch.Generator().manual_seed(seed)
+    vocab_size = model.encoder.backbone.config.vocab_size
+    lengths = torch.randint(2, max_length + 1, (batch_size,), generator=generator)
+    lengths[0] = max_length
+    attention_mask = (torch.arange(max_length).unsqueeze(0) < lengths.unsqueeze(1)).long()
+    return {
+        "input_ids": torch.randint(0, vocab_size, (batch_size, max_length), generator=generator) * attention_mask,
+        "attention_mask": attention_mask,
+        "bbox": torch.randint(0, 1000, (batch_size, max_length, 4), generator=generator).float(),
+        "section_ids": torch.randint(0, 6, (batch_size, max_length), generator=generator),
+    }
+
+
+def export_torchscript(model: SkillExtractModel, output_path: str, max_length: int = 256, with_section: bool = True) -> Path:
+    model.eval()
+    inputs = example_inputs(model, max_length=max_length)
+    with torch.no_grad():
+        core = torch.jit.trace(
+            _EmissionCore(model, with_section).eval(),
+            (inputs["input_ids"], inputs["attention_mask"], inputs["bbox"], inputs["section_ids"]),
+            strict=False,
+        )
+        graph = torch.jit.script(SkillTaggerGraph(core, model).eval())
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    graph.save(str(output_path))
+    return output_path
+
+
+def load_torchscript(path: str, map_location: str = "cpu"):
+    graph = torch.jit.load(str(path), map_location=map_location)
+    graph.eval()
+    return graph
+
+
+def check_parity(model: SkillExtractModel, graph, batches: int = 4, batch_size: int = 4, max_length: int = 256) -> Dict[str, float]:
+    """Compare exported tags/emissions with ``SkillExtractModel.forward`` (``crf.decode``)."""
+    model.eval()
+    agree = total = 0
+    identical = 0
+    max_diff = 0.0
+    with torch.no_grad():
+        for b in range(batches):
+            inputs = example_inputs(model, batch_size, max_length, seed=b + 1)
+            ref = model(**inputs)
+            tags, emissions, _ = graph(inputs["input_ids"], inputs["attention_mask"], inputs["bbox"], inputs["section_ids"])
+            max_diff = max(max_diff, float((ref["emissions"] - emissions).abs().max()))
+            lengths = inputs["attention_mask"].sum(1).tolist()
+            for i, length in enumerate(lengths):
+                expected = ref["token_predictions"][i]
+                expected = list(expected) if isinstance(expected, list) else expected[:length].tolist()
+                got = tags[i, :length].tolist()
+                agree += sum(int(a == g) for a, g in zip(expected, got))
+                total += length
+                identical += int(expected == got)
+    sequences = batches * batch_size
+    return {
+        "tag_agreement": agree / max(total, 1),
+        "identical_sequences": identical / max(sequences, 1),
+        "max_emission_abs_diff": max_diff,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export SkillExtractModel to TorchScript and check decode parity.")
+    parser.add_argument("--model_path", default="models/skill_extract_model.pt")
+    parser.add_argument("--base_model", default="distilbert-base-uncased")
+    parser.add_argument("--output", default="models/skill_extract_model.ts")
+    parser.add_argument("--num_layers", type=int, default=None, help="Backbone depth of a distilled student checkpoint")
+    parser.add_argument("--max_length", type=int, default=256)
+    parser.add_argument("--skip_section", action="store_true")
+    parser.add_argument("--parity_batches", type=int, default=4)
+    args = parser.parse_args()
+
+    model = SkillExtractModel(base_model=args.base_model, num_layers=args.num_layers)
+    model.load_state_dict(torch.load(args.model_path, map_location="cpu"))
+    out = export_torchscript(model, args.output, args.max_length, with_section=not args.skip_section)
+    report = check_parity(model, load_torchscript(out), batches=args.parity_batches, max_length=args.max_length)
+    print(json.dumps({"output": str(out), **report}, indent=2))
+    if report["tag_agreement"] < 1.0:
+        raise SystemExit("Exported graph disagrees with the reference decode.")
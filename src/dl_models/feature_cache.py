@@ -0,0 +1,84 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+META_FILE = "meta.json"
+STATES_FILE = "hidden_states.npy"
+
+
+def dataset_fingerprint(dataset, base_model: str, num_layers: int | None) -> str:
+    """Identifies the backbone and the exact tokenized inputs a cache was built from."""
+    digest = hashlib.sha1(json.dumps([base_model, num_layers, dataset.max_length, len(dataset)]).encode())
+    for idx in range(len(dataset)):
+        item = dataset[idx]
+        digest.update(item["input_ids"].numpy().tobytes())
+        digest.update(item["attention_mask"].numpy().tobytes())
+    return digest.hexdigest()
+
+
+@torch.no_grad()
+def build_feature_cache(encoder, dataset, cache_dir: str, base_model: str, num_layers: int | None = None,
+                        batch_size: int = 32, device: torch.device | None = None) -> Path:
+    """
+    Run the (frozen) backbone once per sample and store ``last_hidden_state`` as a float16 memmap
+    of shape ``(len(dataset), max_length, hidden)``. An existing cache with the same fingerprint is reused.
+    """
+    cache_dir = Path(cache_dir)
+    fingerprint = dataset_fingerprint(dataset, base_model, num_layers)
+    meta_path = cache_dir / META_FILE
+    if meta_path.exists() and json.loads(meta_path.read_text(encoding="utf-8")).get("fingerprint") == fingerprint:
+        return cache_dir
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    meta_path.unlink(missing_ok=True)
+    device = device or torch.device("cpu")
+    backbone = encoder.backbone.to(device).eval()
+    hidden = backbone.config.hidden_size
+    states = np.lib.format.open_memmap(
+        cache_dir / STATES_FILE, mode="w+", dtype=np.float16, shape=(len(dataset), dataset.max_length, hidden)
+    )
+
+    start = 0
+    for batch in DataLoader(dataset, batch_size=batch_size):
+        out = backbone(input_ids=batch["input_ids"].to(device), attention_mask=batch["attention_mask"].to(device))
+        rows = out.last_hidden_state.to(torch.float16).cpu().numpy()
+        states[start : start + len(rows)] = rows
+        start += len(rows)
+    states.flush()
+    del states
+
+    meta = {
+        "fingerprint": fingerprint,
+        "base_model": base_model,
+        "num_layers": num_layers,
+        "samples": len(dataset),
+        "max_length": dataset.max_length,
+        "hidden_size": hidden,
+    }
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return cache_dir
+
+
+class CachedFeatureDataset(Dataset):
+    """Wraps a ``ResumeDataset`` and adds each sample's cached backbone ``hidden_states``."""
+
+    def __init__(self, dataset, cache_dir: str):
+        self.dataset = dataset
+        self.cache_dir = Path(cache_dir)
+        self._states = None
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, idx) -> Dict[str, torch.Tensor]:
+        if self._states is None:
+            # Opened lazily so DataLoader worker processes each map the file themselves.
+            self._states = np.load(self.cache_dir / STATES_FILE, mmap_mode="r")
+        item = self.dataset[idx]
+        item["hidden_states"] = torch.from_numpy(np.array(self._states[idx]))
+        return item
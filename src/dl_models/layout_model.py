@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 import torch
 import torch.nn as nn
-from transformers import AutoModel
+from transformers import AutoConfig, AutoModel
 
 
 @dataclass
@@ -14,9 +14,14 @@ class LayoutModelOutput:
 class LayoutAwareEncoder(nn.Module):
     """LayoutLMv3-inspired encoder using textual backbone + learned spatial features."""
 
-    def __init__(self, model_name: str = "distilbert-base-uncased", spatial_dim: int = 64):
+    def __init__(self, model_name: str = "distilbert-base-uncased", spatial_dim: int = 64, num_layers: int | None = None):
         super().__init__()
-        self.backbone = AutoModel.from_pretrained(model_name)
+        if num_layers:
+            # Keep only the first ``num_layers`` transformer blocks (e.g. a small distillation student).
+            config = AutoConfig.from_pretrained(model_name, num_hidden_layers=num_layers)
+            self.backbone = AutoModel.from_pretrained(model_name, config=config)
+        else:
+            self.backbone = AutoModel.from_pretrained(model_name)
         hidden = self.backbone.config.hidden_size
         self.spatial_proj = nn.Sequential(
             nn.Linear(4, spatial_dim),
@@ -26,9 +31,17 @@ class LayoutAwareEncoder(nn.Module):
         self.section_embed = nn.Embedding(8, hidden)
         self.layer_norm = nn.LayerNorm(hidden)
 
-    def forward(self, input_ids, attention_mask, bbox, section_ids):
-        x = self.backbone(input_ids=input_ids, attention_mask=attention_mask)
-        text_out = x.last_hidden_state
+    def freeze_backbone(self):
+        self.backbone.requires_grad_(False)
+        self.backbone.eval()
+
+    def forward(self, input_ids, attention_mask, bbox, section_ids, hidden_states=None):
+        """``hidden_states`` (cached backbone ``last_hidden_state``) skips the backbone and only runs the fusion."""
+        if hidden_states is None:
+            hidden_states = self.backbone(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+        return self.fuse(hidden_states.float(), bbox, section_ids)
+
+    def fuse(self, text_out, bbox, section_ids):
         spatial = self.spatial_proj(bbox.float())
         section = self.section_embed(section_ids)
         fused = self.layer_norm(text_out + spatial + section)
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+RegistryKey = Tuple[Hashable, ...]
+
+
+def model_nbytes(obj: Any) -> int:
+    """Parameter + buffer bytes of a torch module, or of every module in a tuple/list."""
+    if isinstance(obj, (tuple, list)):
+        return sum(model_nbytes(item) for item in obj)
+    total = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(obj, attr, None)
+        if callable(tensors):
+            try:
+                total += sum(t.numel() * t.element_size() for t in tensors())
+            except Exception:
+                pass
+    return total
+
+
+@dataclass
+class _Entry:
+    key: RegistryKey
+    model: Any
+    nbytes: int
+    load_seconds: float
+    refcount: int = 0
+    hits: int = 0
+    last_used: float = field(default_factory=time.time)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models keyed by ``(backend, name, *options)``.
+
+    ``acquire`` returns the shared instance, loading it once on first use, and
+    bumps its reference count. ``release`` drops the count. A released model stays
+    resident so a later ``acquire`` is a hit. It only becomes evictable
+    (least-recently-used first) once the resident total exceeds ``budget_bytes``.
+    Models that are still referenced are never evicted. A budget of 0 means unlimited.
+
+    Shared instances must be treated as read-only. Callers that fine-tune or load
+    their own weights should construct a private model instead.
+    """
+
+    def __init__(self, budget_bytes: int = 0):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._lock = threading.Lock()
+        self._loading: Dict[RegistryKey, threading.Lock] = {}
+        self._entries: "OrderedDict[RegistryKey, _Entry]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def set_budget(self, budget_bytes: int) -> None:
+        with self._lock:
+            self.budget_bytes = max(0, int(budget_bytes))
+            self._evict()
+
+    def acquire(self, backend: str, name: str, loader: Callable[[], Any], *options: Hashable) -> Any:
+        key = (backend, name, *options)
+        with self._lock:
+            if self._checkout(key):
+                return self._entries[key].model
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if self._checkout(key):
+                    return self._entries[key].model
+            start = time.perf_counter()
+            model = loader()
+            entry = _Entry(key=key, model=model, nbytes=model_nbytes(model), load_seconds=time.perf_counter() - start, refcount=1)
+            with self._lock:
+                self._misses += 1
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self._evict()
+            return model
+
+    def release(self, backend: str, name: str, *options: Hashable) -> None:
+        key = (backend, name, *options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refcount > 0:
+                entry.refcount -= 1
+                self._evict()
+
+    @contextmanager
+    def lease(self, backend: str, name: str, loader: Callable[[], Any], *options: Hashable):
+        model = self.acquire(backend, name, loader, *options)
+        try:
+            yield model
+        finally:
+            self.release(backend, name, *options)
+
+    def clear(self) -> None:
+        """Drop every unreferenced model."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                del self._entries[key]
+                self._evictions += 1
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models: List[Dict[str, Any]] = [
+                {
+                    "backend": str(entry.key[0]),
+                    "name": str(entry.key[1]),
+                    "options": [str(option) for option in entry.key[2:]],
+                    "memory_bytes": entry.nbytes,
+                    "load_seconds": entry.load_seconds,
+                    "hits": entry.hits,
+                    "refcount": entry.refcount,
+                    "last_used": entry.last_used,
+                }
+                for entry in self._entries.values()
+            ]
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": sum(entry.nbytes for entry in self._entries.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "models": models,
+            }
+
+    def _checkout(self, key: RegistryKey) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        entry.refcount += 1
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return True
+
+    def _evict(self) -> None:
+        if not self.budget_bytes:
+            return
+        resident = sum(entry.nbytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if resident <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refcount == 0:
+                resident -= entry.nbytes
+                del self._entries[key]
+                self._evictions += 1
+
+
+model_registry = ModelRegistry(int(float(os.environ.get("MODEL_MEMORY_BUDGET_MB", "0")) * 2**20))
@@ -1,6 +1,7 @@
 import torch
 import torch.nn as nn
 
+from src.dl_models.crf_decoding import viterbi_decode
 from src.dl_models.layout_model import LayoutAwareEncoder
 
 try:
@@ -10,17 +11,19 @@ except Exception:  # optional dependency fallback
 
 
 class SkillExtractModel(nn.Module):
-    def __init__(self, base_model: str = "distilbert-base-uncased", num_tags: int = 3, num_sections: int = 6):
+    def __init__(self, base_model: str = "distilbert-base-uncased", num_tags: int = 3, num_sections: int = 6,
+                 num_layers: int | None = None):
         super().__init__()
-        self.encoder = LayoutAwareEncoder(base_model)
+        self.encoder = LayoutAwareEncoder(base_model, num_layers=num_layers)
         hidden = self.encoder.backbone.config.hidden_size
         self.tag_head = nn.Linear(hidden, num_tags)
         self.section_head = nn.Linear(hidden, num_sections)
         self.use_crf = CRF is not None
         self.crf = CRF(num_tags, batch_first=True) if self.use_crf else None
 
-    def forward(self, input_ids, attention_mask, bbox, section_ids, labels=None, section_labels=None):
-        out = self.encoder(input_ids=input_ids, attention_mask=attention_mask, bbox=bbox, section_ids=section_ids)
+    def forward(self, input_ids, attention_mask, bbox, section_ids, labels=None, section_labels=None, hidden_states=None):
+        out = self.encoder(input_ids=input_ids, attention_mask=attention_mask, bbox=bbox, section_ids=section_ids,
+                           hidden_states=hidden_states)
         emissions = self.tag_head(out.sequence_output)
         section_logits = self.section_head(out.pooled_output)
 
@@ -44,3 +47,26 @@ class SkillExtractModel(nn.Module):
             "token_predictions": pred_tags,
             "section_logits": section_logits,
         }
+
+    def decode(self, emissions, attention_mask):
+        """Padded (batch, seq_len) tag tensor; batched Viterbi when a CRF is present."""
+        if self.use_crf:
+            return viterbi_decode(
+                emissions,
+                attention_mask,
+                self.crf.start_transitions,
+                self.crf.end_transitions,
+                self.crf.transitions,
+            )
+        return emissions.argmax(-1)
+
+    @torch.no_grad()
+    def predict(self, input_ids, attention_mask, bbox, section_ids, with_section: bool = True):
+        """Inference-only path: no loss, tensorized decode, optional section head."""
+        out = self.encoder(input_ids=input_ids, attention_mask=attention_mask, bbox=bbox, section_ids=section_ids)
+        emissions = self.tag_head(out.sequence_output)
+        return {
+            "emissions": emissions,
+            "token_predictions": self.decode(emissions, attention_mask),
+            "section_logits": self.section_head(out.pooled_output) if with_section else None,
+        }
@@ -1,10 +1,16 @@
 import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from src.pipeline.preprocess import preprocess_resume
+from src.pipeline.preprocess import clean_text, preprocess_resume
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
 
 
 def _find_resume_column(df: pd.DataFrame) -> str:
@@ -15,7 +21,136 @@ def _find_resume_column(df: pd.DataFrame) -> str:
     return df.columns[0]
 
 
-def build_processed_jsonl(dataset_path: str, output_path: str, max_samples: int | None = None) -> Path:
+def _permutations(num_perm: int, seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(text: str, num_perm: int = 128, shingle_size: int = 5, seed: int = 1) -> np.ndarray:
+    """MinHash of the word ``shingle_size``-grams of ``clean_text(text)`` (stable across processes)."""
+    words = clean_text(text).lower().split()
+    shingles = {" ".join(words[i:i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    a, b = _permutations(num_perm, seed)
+    # a * x stays below 2**62, so the universal hash never overflows uint64.
+    permuted = (a[:, None] * (hashes[None, :] % _MERSENNE_PRIME) + b[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def _signature_worker(args: Tuple[str, int, int]) -> np.ndarray:
+    return minhash_signature(*args)
+
+
+def compute_signatures(texts: List[str], num_perm: int = 128, shingle_size: int = 5,
+                       workers: int | None = None) -> np.ndarray:
+    """``(len(texts), num_perm)`` uint32 signatures, computed across a process pool."""
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    jobs = ((text, num_perm, shingle_size) for text in texts)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for i, job in enumerate(jobs):
+            signatures[i] = _signature_worker(job)
+        return signatures
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(texts) // (workers * 8))
+        for i, signature in enumerate(pool.map(_signature_worker, jobs, chunksize=chunksize)):
+            signatures[i] = signature
+    return signatures
+
+
+def lsh_params(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Bands/rows whose S-curve midpoint ``(1/bands) ** (1/rows)`` is the highest one not above
+    ``threshold``. Erring low favours recall; candidates are verified on the full signature.
+    """
+    candidates = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    midpoint = lambda br: (1.0 / br[0]) ** (1.0 / br[1])  # noqa: E731
+    below = [br for br in candidates if midpoint(br) <= threshold]
+    return max(below, key=midpoint) if below else min(candidates, key=midpoint)
+
+
+def near_duplicate_groups(signatures: np.ndarray, threshold: float = 0.8) -> Tuple[np.ndarray, Dict]:
+    """
+    Group records whose estimated Jaccard similarity reaches ``threshold``.
+
+    Each LSH band hashes into a bucket keyed by its rows, so candidates are found
+    in ``O(records * bands)`` instead of all pairs. A candidate is merged (union-find)
+    only if its full-signature agreement with the bucket's first record confirms it.
+    Returns a group id per record (the id of the group's first record) and stats.
+    """
+    n, num_perm = signatures.shape
+    bands, rows = lsh_params(num_perm, threshold)
+    parent = np.arange(n)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i in range(n):
+            first = buckets.setdefault(block[i].tobytes(), i)
+            if first == i:
+                continue
+            root_i, root_first = find(i), find(first)
+            if root_i != root_first and np.mean(signatures[i] == signatures[first]) >= threshold:
+                parent[max(root_i, root_first)] = min(root_i, root_first)
+
+    groups = np.array([find(i) for i in range(n)], dtype=np.int64)
+    unique, counts = np.unique(groups, return_counts=True)
+    stats = {
+        "records": int(n),
+        "groups": int(len(unique)),
+        "duplicates": int(n - len(unique)),
+        "dedup_ratio": float((n - len(unique)) / n) if n else 0.0,
+        "largest_group": int(counts.max()) if n else 0,
+        "threshold": threshold,
+        "bands": bands,
+        "rows": rows,
+    }
+    return groups, stats
+
+
+def split_by_group(records: List[dict], train_fraction: float = 0.8) -> Tuple[List[dict], List[dict]]:
+    """Order-preserving split that never puts two records of one ``group`` on different sides."""
+    target = int(train_fraction * len(records))
+    group_sizes: Dict = {}
+    for i, rec in enumerate(records):
+        key = rec.get("group", f"record-{i}")
+        group_sizes[key] = group_sizes.get(key, 0) + 1
+
+    train_groups, filled = set(), 0
+    for key, size in group_sizes.items():
+        if filled >= target:
+            break
+        train_groups.add(key)
+        filled += size
+
+    train, test = [], []
+    for i, rec in enumerate(records):
+        (train if rec.get("group", f"record-{i}") in train_groups else test).append(rec)
+    return train, test
+
+
+def build_processed_jsonl(dataset_path: str, output_path: str, max_samples: int | None = None,
+                          dedup: str = "group", dedup_threshold: float = 0.8, num_perm: int = 128,
+                          workers: int | None = None) -> Path:
+    """
+    Preprocess the resume CSV into JSONL.
+
+    ``dedup="group"`` tags each record with its near-duplicate ``group`` (for
+    ``split_by_group``), ``"drop"`` keeps only the first record of each group before
+    preprocessing, ``"off"`` disables the MinHash LSH stage. Dedup stats are written
+    next to the output as ``<name>.dedup.json``.
+    """
+    if dedup not in {"off", "group", "drop"}:
+        raise ValueError("dedup must be 'off', 'group' or 'drop'.")
+
     dataset_path = Path(dataset_path)
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -26,26 +161,43 @@ def build_processed_jsonl(dataset_path: str, output_path: str, max_samples: int
 
     df = pd.read_csv(csv_files[0])
     resume_col = _find_resume_column(df)
-    rows = df[resume_col].dropna().tolist()
+    rows = [str(text) for text in df[resume_col].dropna().tolist()]
     if max_samples:
         rows = rows[:max_samples]
 
+    groups = None
+    if dedup != "off" and rows:
+        signatures = compute_signatures(rows, num_perm=num_perm, workers=workers)
+        groups, stats = near_duplicate_groups(signatures, dedup_threshold)
+        stats["mode"] = dedup
+        output_path.with_suffix(".dedup.json").write_text(json.dumps(stats, indent=2), encoding="utf-8")
+        print(f"Near-duplicates: {stats['duplicates']}/{stats['records']} records "
+              f"(dedup ratio {stats['dedup_ratio']:.3f}, {stats['groups']} groups)")
+
     with output_path.open("w", encoding="utf-8") as f:
-        for text in rows:
-            sample = preprocess_resume(str(text))
+        for i, text in enumerate(rows):
+            if dedup == "drop" and groups[i] != i:
+                continue
+            sample = preprocess_resume(text)
             record = {
                 "tokens": sample.tokens,
                 "bbox": sample.bboxes,
                 "section": sample.sections,
                 "labels": sample.labels,
             }
+            if groups is not None:
+                record["group"] = int(groups[i])
             f.write(json.dumps(record) + "\n")
     return output_path
 
 
 def load_jsonl(path: str) -> List[dict]:
+    """Records from a JSONL file, or from every ``*.jsonl`` shard in a directory (in name order)."""
+    path = Path(path)
+    files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
     data = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            data.append(json.loads(line))
+    for file in files:
+        with open(file, "r", encoding="utf-8") as f:
+            for line in f:
+                data.append(json.loads(line))
     return data
@@ -0,0 +1,306 @@
+"""
+Ingest a directory of resume PDFs into sharded JSONL training data with real word geometry.
+
+Each PDF becomes one ``build_processed_jsonl``-style record (``tokens``, ``bbox``,
+``section``, ``labels``), plus its ``source`` path and page count. Boxes are normalized
+to a 0-1000 page scale. Words are grouped into lines for ``detect_sections``, and labels
+come from ``build_bio_labels``.
+
+PDFs are parsed in a process pool. Shards are written as ``shard-NNNNN.jsonl`` and renamed
+into place only once complete. The sorted file list is frozen in ``files.txt`` on the first
+run, so an interrupted run resumes from the first missing shard. Per-shard counts and
+failures are kept in ``manifest.json``.
+
+    python -m src.pipeline.pdf_corpus data/raw/pdfs data/processed/pdf_shards --workers 8
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from src.pipeline.preprocess import build_bio_labels, detect_sections
+from src.spatial_engine.extraction import BACKENDS, DEFAULT_BACKEND, ExtractionLimits, ExtractionReport
+from src.spatial_engine.pdf_parser import BBOX_SCALE, extract_pdf_tokens
+
+FILES_LIST = "files.txt"
+MANIFEST = "manifest.json"
+
+
+def _lines(pdf_tokens: List[dict]) -> Iterator[List[dict]]:
+    """Consecutive words on the same page whose tops lie within half a word height of the line's first word."""
+    line: List[dict] = []
+    for token in pdf_tokens:
+        if line:
+            first = line[0]
+            tolerance = max(1, (first["bbox"][3] - first["bbox"][1]) // 2)
+            if token["page"] != first["page"] or abs(token["bbox"][1] - first["bbox"][1]) > tolerance:
+                yield line
+                line = []
+        line.append(token)
+    if line:
+        yield line
+
+
+def pdf_record(pdf_path: str, backend: str = DEFAULT_BACKEND, limits: ExtractionLimits | None = None,
+               skill_lexicon: set | None = None, report: ExtractionReport | None = None) -> dict:
+    """One training record for a PDF, with boxes normalized to ``[0, BBOX_SCALE]``."""
+    report = report if report is not None else ExtractionReport()
+    pdf_tokens = extract_pdf_tokens(pdf_path, backend, scale=BBOX_SCALE, limits=limits, report=report)
+    lines = list(_lines(pdf_tokens))
+    line_sections = detect_sections([" ".join(t["text"] for t in line) for line in lines])
+
+    tokens, bboxes, sections = [], [], []
+    for line, section in zip(lines, line_sections):
+        for token in line:
+            tokens.append(token["text"])
+            bboxes.append(token["bbox"])
+            sections.append(section)
+    return {
+        "tokens": tokens,
+        "bbox": bboxes,
+        "section": sections,
+        "labels": build_bio_labels(tokens, skill_lexicon),
+        "pages": report.pages,
+    }
+
+
+def _ingest_worker(args: Tuple[str, str, str, ExtractionLimits, set | None]) -> dict:
+    path, source, backend, limits, skill_lexicon = args
+    report = ExtractionReport()
+    try:
+        record = pdf_record(path, backend, limits, skill_lexicon, report)
+    except Exception as exc:
+        return {"source": source, "error": f"{type(exc).__name__}: {exc}"}
+    record["source"] = source
+    if report.truncated:
+        record["partial"] = report.reason
+    return record
+
+
+def _file_list(input_dir: Path, output_dir: Path) -> List[str]:
+    files_path = output_dir / FILES_LIST
+    if files_path.exists():
+        return files_path.read_text(encoding="utf-8").splitlines()
+    files = sorted(str(p.relative_to(input_dir)) for p in input_dir.rglob("*") if p.suffix.lower() == ".pdf")
+    tmp = files_path.with_suffix(".tmp")
+    tmp.write_text("\n".join(files), encoding="utf-8")
+    os.replace(tmp, files_path)
+    return files
+
+
+def _load_manifest(output_dir: Path, settings: Dict) -> Dict:
+    path = output_dir / MANIFEST
+    if not path.exists():
+        return {**settings, "shards": {}}
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    changed = [key for key, value in settings.items() if manifest.get(key) != value]
+    if changed:
+        raise ValueError(f"{output_dir} was built with different {', '.join(changed)}; use a new output directory.")
+    return manifest
+
+
+def _save_manifest(output_dir: Path, manifest: Dict) -> None:
+    path = output_dir / MANIFEST
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_shard(shard_path: Path, results: Iterator[dict]) -> Dict:
+    stats = {"records": 0, "empty": 0, "partial": 0, "failed": []}
+    tmp = shard_path.with_suffix(".jsonl.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for record in results:
+            if "error" in record:
+                stats["failed"].append([record["source"], record["error"]])
+            elif not record["tokens"]:
+                stats["empty"] += 1
+            else:
+                stats["records"] += 1
+                stats["partial"] += "partial" in record
+                f.write(json.dumps(record) + "\n")
+    os.replace(tmp, shard_path)
+    return stats
+
+
+@dataclass
+class _Shard:
+    index: int
+    jobs: List[tuple]
+    futures: List[Future | None] = field(default_factory=list)
+    position: int = -1  # PDF currently being read; -1 before reading starts
+
+
+def _kill(pool: ProcessPoolExecutor) -> None:
+    """Stop a pool whose worker crashed or hangs; a running task cannot be cancelled any other way."""
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Runner:
+    """
+    One future per PDF on a process pool that is rebuilt after a worker crash or timeout.
+
+    Results are read in submission order. The earliest unfinished PDF is therefore
+    the one a worker is running, so the per-PDF ``timeout`` is measured from when
+    the caller starts waiting on it. If the pool breaks, the PDF being waited on
+    is re-run alone in a fresh single-worker pool. Only if it fails there too is
+    it recorded as the crash. Every unfinished PDF is then resubmitted to a new
+    pool.
+    """
+
+    def __init__(self, workers: int, timeout: float) -> None:
+        self.workers = workers
+        self.timeout = timeout or None
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.queued: deque = deque()
+        self.restarts = 0
+
+    def submit(self, shard: _Shard) -> None:
+        self.queued.append(shard)
+        try:
+            for job in shard.jobs:
+                shard.futures.append(self.pool.submit(_ingest_worker, job))
+        except BrokenProcessPool:
+            # A worker died while this shard was being queued; resubmit to a new pool.
+            self._restart()
+
+    def results(self, shard: _Shard) -> Iterator[dict]:
+        for shard.position, job in enumerate(shard.jobs):
+            future = shard.futures[shard.position]
+            try:
+                yield future.result(timeout=self.timeout)
+            except FuturesTimeout:
+                self._restart()
+                yield {"source": job[1], "error": f"Timed out after {self.timeout:.0f}s"}
+            except BrokenProcessPool:
+                self._restart()
+                yield self._isolated(job)
+        self.queued.remove(shard)
+
+    def _isolated(self, job: tuple) -> dict:
+        solo = ProcessPoolExecutor(max_workers=1)
+        try:
+            return solo.submit(_ingest_worker, job).result(timeout=self.timeout)
+        except FuturesTimeout:
+            return {"source": job[1], "error": f"Timed out after {self.timeout:.0f}s"}
+        except BrokenProcessPool:
+            return {"source": job[1], "error": "Worker process crashed (segfault or out of memory)"}
+        finally:
+            _kill(solo)
+
+    def _restart(self) -> None:
+        _kill(self.pool)
+        self.restarts += 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        for shard in self.queued:
+            shard.futures.extend([None] * (len(shard.jobs) - len(shard.futures)))
+            for k in range(shard.position + 1, len(shard.jobs)):
+                future = shard.futures[k]
+                if future is None or not future.done() or future.cancelled() or future.exception() is not None:
+                    shard.futures[k] = self.pool.submit(_ingest_worker, shard.jobs[k])
+
+    def close(self) -> None:
+        _kill(self.pool)
+
+
+def ingest_pdf_corpus(input_dir: str, output_dir: str, shard_size: int = 1000, workers: int | None = None,
+                      backend: str = DEFAULT_BACKEND, limits: ExtractionLimits | None = None,
+                      skill_lexicon: set | None = None, timeout_seconds: float = 120.0) -> Dict:
+    """
+    Parse every PDF under ``input_dir`` into ``output_dir/shard-NNNNN.jsonl``.
+
+    Completed shards are skipped, so re-running the same command resumes an interrupted
+    ingest. At most two shards are in flight: the next shard's documents are queued to
+    the pool while the current one is written, so the pool never drains between shards.
+    A PDF that crashes its worker or runs past ``timeout_seconds`` (0 disables) is
+    recorded in the shard's ``failed`` list and the run continues. Returns the manifest.
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    limits = limits or ExtractionLimits()
+    files = _file_list(input_dir, output_dir)
+    settings = {
+        "input_dir": str(input_dir.resolve()),
+        "files": len(files),
+        "shard_size": shard_size,
+        "backend": backend,
+        "bbox_scale": BBOX_SCALE,
+        "limits": [limits.max_pages, limits.max_words, limits.deadline_seconds],
+    }
+    manifest = _load_manifest(output_dir, settings)
+
+    num_shards = -(-len(files) // shard_size)
+    shard_names = [f"shard-{i:05d}.jsonl" for i in range(num_shards)]
+    pending = [i for i, name in enumerate(shard_names) if not (output_dir / name).exists()]
+    total_docs = sum(len(files[i * shard_size : (i + 1) * shard_size]) for i in pending)
+    print(f"{len(files)} PDFs in {num_shards} shards; {len(pending)} shards ({total_docs} PDFs) to ingest")
+
+    start, done = time.perf_counter(), 0
+    runner = _Runner(workers or os.cpu_count() or 1, timeout_seconds)
+
+    def finish(shard: _Shard) -> None:
+        nonlocal done
+        name = shard_names[shard.index]
+        stats = _write_shard(output_dir / name, runner.results(shard))
+        manifest["shards"][name] = stats
+        _save_manifest(output_dir, manifest)
+        done += stats["records"] + stats["empty"] + len(stats["failed"])
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        eta = (total_docs - done) / rate if rate else 0.0
+        print(f"[{done}/{total_docs}] {name}: {stats['records']} records, {stats['empty']} empty, "
+              f"{len(stats['failed'])} failed | {rate:.1f} PDFs/s, ETA {eta / 60:.1f} min", flush=True)
+
+    try:
+        for index in pending:
+            jobs = [
+                (str(input_dir / source), source, backend, limits, skill_lexicon)
+                for source in files[index * shard_size : (index + 1) * shard_size]
+            ]
+            runner.submit(_Shard(index, jobs))
+            if len(runner.queued) > 1:
+                finish(runner.queued[0])
+        while runner.queued:
+            finish(runner.queued[0])
+    finally:
+        runner.close()
+
+    shards = manifest["shards"].values()
+    manifest["records"] = sum(s["records"] for s in shards)
+    manifest["failed"] = sum(len(s["failed"]) for s in shards)
+    manifest["pool_restarts"] = manifest.get("pool_restarts", 0) + runner.restarts
+    _save_manifest(output_dir, manifest)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a PDF corpus into sharded JSONL with real word boxes.")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--shard_size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=sorted(BACKENDS))
+    parser.add_argument("--max_pages", type=int, default=10, help="0 disables the page limit")
+    parser.add_argument("--max_words", type=int, default=20000, help="0 disables the word limit")
+    parser.add_argument("--deadline_seconds", type=float, default=30.0, help="0 disables the per-PDF deadline")
+    parser.add_argument("--timeout_seconds", type=float, default=120.0,
+                        help="Kill a worker stuck on one PDF after this long (0 disables)")
+    args = parser.parse_args()
+    result = ingest_pdf_corpus(
+        args.input_dir,
+        args.output_dir,
+        shard_size=args.shard_size,
+        workers=args.workers,
+        backend=args.backend,
+        limits=ExtractionLimits(args.max_pages, args.max_words, args.deadline_seconds),
+        timeout_seconds=args.timeout_seconds,
+    )
+    print(f"{result['records']} records, {result['failed']} failed -> {args.output_dir}")
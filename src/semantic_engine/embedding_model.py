@@ -1,10 +1,18 @@
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from src.dl_models.registry import model_registry
+
 
 class ContextualEmbeddingModel:
     def __init__(self, model_name: str = "sentence-transformers/all-mpnet-base-v2"):
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.model = model_registry.acquire("sentence-transformers", model_name, lambda: SentenceTransformer(model_name))
+
+    def close(self):
+        if self.model is not None:
+            model_registry.release("sentence-transformers", self.model_name)
+            self.model = None
 
     def encode(self, texts: list[str]):
         return self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
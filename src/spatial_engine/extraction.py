@@ -0,0 +1,343 @@
+"""Shared PDF word-box extraction with pluggable backends.
+
+``pdfplumber`` is the accurate mode (pdfminer layout analysis). ``pdfium`` is the
+fast mode: it reads character boxes straight from pypdfium2's text-page API
+(already a pdfplumber dependency) and groups them into words with the same
+x/y tolerances pdfplumber uses. Every parser in the repo adapts
+``iter_pages`` to its own output shape.
+
+Pages are produced lazily and each page's parsed layout objects are released
+as soon as its words are read, so ``ExtractionLimits`` (page and word budgets,
+a wall-clock deadline) bound both the work and the memory spent on a document.
+Deadline-bound parses run on reader threads drawn from a process-wide pool of
+``set_max_parsers`` slots, which also caps how many abandoned pages can still
+be parsing at once.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+DEFAULT_BACKEND = "pdfplumber"
+DEFAULT_MAX_PARSERS = 4
+
+_parser_slots = threading.BoundedSemaphore(DEFAULT_MAX_PARSERS)
+
+
+def set_max_parsers(count: int) -> None:
+    """Size the pool of deadline-bound reader threads; readers already running keep their slot."""
+    global _parser_slots
+    _parser_slots = threading.BoundedSemaphore(max(1, count))
+
+
+class ExtractionBusy(RuntimeError):
+    """Every reader slot is taken, including by pages abandoned at their deadline."""
+
+
+@dataclass
+class ExtractedWord:
+    text: str
+    x0: float
+    top: float
+    x1: float
+    bottom: float
+
+
+@dataclass
+class ExtractedPage:
+    index: int
+    width: float
+    height: float
+    words: List[ExtractedWord] = field(default_factory=list)
+
+
+@dataclass
+class ExtractionLimits:
+    """
+    Per-document budgets; 0 disables a limit.
+
+    The deadline is a hard bound on the caller's wait. Pages are parsed on a
+    reader thread, and a page still being parsed at the deadline is abandoned:
+    the caller gets the pages read so far, flagged ``deadline``. The abandoned
+    thread finishes that one page in the background before closing the PDF,
+    and keeps its reader slot until then. With every slot taken, a new
+    deadline-bound extraction raises ``ExtractionBusy`` at once instead of
+    starting another thread, so a burst of pathological uploads holds at most
+    ``set_max_parsers`` pages in memory. The word budget cuts a page only after
+    it has been fully parsed. For hard isolation of untrusted corpora, run
+    extraction in a process that can be killed, as ``src.pipeline.pdf_corpus`` does.
+    """
+
+    max_pages: int = 0
+    max_words: int = 0
+    deadline_seconds: float = 0.0
+
+
+@dataclass
+class ExtractionReport:
+    total_pages: int = 0
+    pages: int = 0
+    words: int = 0
+    seconds: float = 0.0
+    truncated: bool = False
+    reason: str | None = None
+
+
+def _pdfplumber_pages(pdf_path: Path, report: ExtractionReport | None = None) -> Iterator[ExtractedPage]:
+    import pdfplumber
+
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        if report is not None:
+            report.total_pages = len(pdf.pages)
+        for page_idx, page in enumerate(pdf.pages):
+            words = []
+            for w in page.extract_words() or []:
+                text = (w.get("text") or "").strip()
+                if not text:
+                    continue
+                words.append(
+                    ExtractedWord(
+                        text=text,
+                        x0=float(w.get("x0", 0.0)),
+                        top=float(w.get("top", 0.0)),
+                        x1=float(w.get("x1", 0.0)),
+                        bottom=float(w.get("bottom", 0.0)),
+                    )
+                )
+            extracted = ExtractedPage(
+                index=page_idx,
+                width=float(page.width or 1.0),
+                height=float(page.height or 1.0),
+                words=words,
+            )
+            # Drop the page's cached chars/layout objects before moving on.
+            page.close()
+            yield extracted
+
+
+def _pdfium_pages(pdf_path: Path, report: ExtractionReport | None = None, x_tolerance: float = 3.0,
+                  y_tolerance: float = 3.0) -> Iterator[ExtractedPage]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    if report is not None:
+        report.total_pages = len(pdf)
+    try:
+        for page_idx in range(len(pdf)):
+            page = pdf[page_idx]
+            textpage = page.get_textpage()
+            try:
+                width, height = page.get_size()
+                text = textpage.get_text_range()
+                words = []
+                chars: List[str] = []
+                box = None
+                for i, ch in enumerate(text[: textpage.count_chars()]):
+                    if ch.isspace():
+                        if chars:
+                            words.append(ExtractedWord("".join(chars), *box))
+                            chars, box = [], None
+                        continue
+                    left, bottom, right, top = textpage.get_charbox(i, loose=True)
+                    char_box = (left, height - top, right, height - bottom)
+                    if chars and (
+                        char_box[0] - box[2] > x_tolerance
+                        or char_box[0] < box[0] - x_tolerance
+                        or abs(char_box[1] - box[1]) > y_tolerance
+                    ):
+                        words.append(ExtractedWord("".join(chars), *box))
+                        chars, box = [], None
+                    chars.append(ch)
+                    if box is None:
+                        box = char_box
+                    else:
+                        box = (min(box[0], char_box[0]), min(box[1], char_box[1]), max(box[2], char_box[2]), max(box[3], char_box[3]))
+                if chars:
+                    words.append(ExtractedWord("".join(chars), *box))
+                yield ExtractedPage(index=page_idx, width=float(width or 1.0), height=float(height or 1.0), words=words)
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+BACKENDS: Dict[str, Callable[..., Iterator[ExtractedPage]]] = {
+    "pdfplumber": _pdfplumber_pages,
+    "pdfium": _pdfium_pages,
+}
+
+
+def iter_pages(pdf_path, backend: str = DEFAULT_BACKEND, limits: ExtractionLimits | None = None,
+               report: ExtractionReport | None = None) -> Iterator[ExtractedPage]:
+    """
+    Lazily yield pages from ``backend``. With ``limits``, stop at the page budget, cut
+    the last page at the word budget, or stop once the deadline has passed. The reason
+    is recorded on ``report``. The backend generator is closed on exit, which closes the PDF.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+    if limits is None and report is None:
+        return BACKENDS[backend](Path(pdf_path))
+    report = report if report is not None else ExtractionReport()
+    return _bounded(BACKENDS[backend](Path(pdf_path), report), limits or ExtractionLimits(), report)
+
+
+class _PageReader:
+    """
+    Parses one page per request on a daemon thread so the caller can stop waiting at a deadline.
+
+    The thread holds a reader slot from creation until it has closed the PDF.
+    """
+
+    def __init__(self, pages: Iterator[ExtractedPage]) -> None:
+        self._slots = _parser_slots
+        if not self._slots.acquire(blocking=False):
+            pages.close()
+            raise ExtractionBusy("All PDF reader slots are busy; retry shortly.")
+        self._pages = pages
+        self._requests: "queue.Queue[bool]" = queue.Queue()
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        try:
+            threading.Thread(target=self._run, name="pdf-page-reader", daemon=True).start()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _run(self) -> None:
+        try:
+            while self._requests.get():
+                try:
+                    self._results.put(("page", next(self._pages, None)))
+                except BaseException as exc:
+                    self._results.put(("error", exc))
+                    return
+        finally:
+            try:
+                self._pages.close()
+            finally:
+                self._slots.release()
+
+    def next(self, timeout: float) -> tuple[bool, ExtractedPage | None]:
+        """``(True, page or None at the end)``, or ``(False, None)`` if the page is not ready within ``timeout``."""
+        self._requests.put(True)
+        try:
+            kind, value = self._results.get(timeout=max(timeout, 0.0))
+        except queue.Empty:
+            return False, None
+        if kind == "error":
+            raise value
+        return True, value
+
+    def close(self) -> None:
+        self._requests.put(False)
+
+
+def _bounded(pages: Iterator[ExtractedPage], limits: ExtractionLimits, report: ExtractionReport) -> Iterator[ExtractedPage]:
+    start = time.monotonic()
+    reader = _PageReader(pages) if limits.deadline_seconds else None
+
+    def stop(reason: str) -> None:
+        report.truncated = True
+        report.reason = reason
+
+    try:
+        while True:
+            if limits.max_pages and report.pages >= limits.max_pages:
+                if report.total_pages > report.pages:
+                    stop("max_pages")
+                break
+            if reader is not None:
+                ready, page = reader.next(limits.deadline_seconds - (time.monotonic() - start))
+                if not ready:
+                    stop("deadline")
+                    break
+            else:
+                page = next(pages, None)
+            if page is None:
+                break
+
+            report.pages += 1
+            if limits.max_words and report.words + len(page.words) > limits.max_words:
+                page.words = page.words[: limits.max_words - report.words]
+                report.words += len(page.words)
+                stop("max_words")
+                yield page
+                break
+            report.words += len(page.words)
+            yield page
+            if limits.deadline_seconds and time.monotonic() - start > limits.deadline_seconds:
+                if report.total_pages > report.pages:
+                    stop("deadline")
+                break
+    finally:
+        report.seconds = time.monotonic() - start
+        if reader is not None:
+            reader.close()
+        else:
+            pages.close()
+
+
+def extract_pages(pdf_path, backend: str = DEFAULT_BACKEND) -> List[ExtractedPage]:
+    return list(iter_pages(pdf_path, backend))
+
+
+def _iou(a: ExtractedWord, b: ExtractedWord) -> float:
+    ix = max(0.0, min(a.x1, b.x1) - max(a.x0, b.x0))
+    iy = max(0.0, min(a.bottom, b.bottom) - max(a.top, b.top))
+    inter = ix * iy
+    union = (a.x1 - a.x0) * (a.bottom - a.top) + (b.x1 - b.x0) * (b.bottom - b.top) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def compare_backends(pdf_path, reference: str = "pdfplumber", candidate: str = "pdfium", iou_threshold: float = 0.5) -> Dict:
+    """Word-box agreement and wall-clock speed of ``candidate`` against ``reference``."""
+    timings = {}
+    pages = {}
+    for backend in (reference, candidate):
+        start = time.perf_counter()
+        pages[backend] = extract_pages(pdf_path, backend)
+        timings[backend] = time.perf_counter() - start
+
+    matched = ref_total = cand_total = 0
+    for ref_page, cand_page in zip(pages[reference], pages[candidate]):
+        ref_total += len(ref_page.words)
+        cand_total += len(cand_page.words)
+        pool: Dict[str, List[ExtractedWord]] = {}
+        for w in cand_page.words:
+            pool.setdefault(w.text, []).append(w)
+        for w in ref_page.words:
+            options = pool.get(w.text, [])
+            best = max(options, key=lambda c: _iou(w, c), default=None)
+            if best is not None and _iou(w, best) >= iou_threshold:
+                options.remove(best)
+                matched += 1
+
+    precision = matched / cand_total if cand_total else 0.0
+    recall = matched / ref_total if ref_total else 0.0
+    return {
+        "pdf": str(pdf_path),
+        "reference_words": ref_total,
+        "candidate_words": cand_total,
+        "matched_words": matched,
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "seconds": timings,
+        "speedup": timings[reference] / timings[candidate] if timings[candidate] else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare word boxes and speed between PDF backends.")
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--reference", default="pdfplumber", choices=sorted(BACKENDS))
+    parser.add_argument("--candidate", default="pdfium", choices=sorted(BACKENDS))
+    parser.add_argument("--iou_threshold", type=float, default=0.5)
+    args = parser.parse_args()
+    for pdf in args.pdfs:
+        print(json.dumps(compare_backends(pdf, args.reference, args.candidate, args.iou_threshold), indent=2))
@@ -1,20 +1,36 @@
-from pathlib import Path
 from typing import List
 
-import pdfplumber
+from src.spatial_engine.extraction import DEFAULT_BACKEND, ExtractionLimits, ExtractionReport, iter_pages
 
+# Page-normalized coordinate range the layout model is trained and served on.
+BBOX_SCALE = 1000
 
-def extract_pdf_tokens(pdf_path: str) -> List[dict]:
+
+def normalize_bbox(box: List[float], width: float, height: float, scale: int = BBOX_SCALE) -> List[int]:
+    """Map a page-space ``[x0, top, x1, bottom]`` box onto ``[0, scale]`` in both axes."""
+    sx = scale / width if width > 0 else 0.0
+    sy = scale / height if height > 0 else 0.0
+    x0, top, x1, bottom = box
+    return [
+        min(scale, max(0, int(x0 * sx))),
+        min(scale, max(0, int(top * sy))),
+        min(scale, max(0, int(x1 * sx))),
+        min(scale, max(0, int(bottom * sy))),
+    ]
+
+
+def extract_pdf_tokens(pdf_path: str, backend: str = DEFAULT_BACKEND, scale: int | None = None,
+                       limits: ExtractionLimits | None = None, report: ExtractionReport | None = None) -> List[dict]:
+    """Word tokens with boxes in PDF points, or normalized to ``[0, scale]`` of the page when ``scale`` is set."""
     tokens = []
-    with pdfplumber.open(Path(pdf_path)) as pdf:
-        for page_idx, page in enumerate(pdf.pages):
-            words = page.extract_words() or []
-            for w in words:
-                tokens.append(
-                    {
-                        "text": w.get("text", ""),
-                        "bbox": [int(w.get("x0", 0)), int(w.get("top", 0)), int(w.get("x1", 0)), int(w.get("bottom", 0))],
-                        "page": page_idx,
-                    }
-                )
+    for page in iter_pages(pdf_path, backend, limits=limits, report=report):
+        for w in page.words:
+            box = [w.x0, w.top, w.x1, w.bottom]
+            tokens.append(
+                {
+                    "text": w.text,
+                    "bbox": normalize_bbox(box, page.width, page.height, scale) if scale else [int(v) for v in box],
+                    "page": page.index,
+                }
+            )
     return tokens
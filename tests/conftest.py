@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# Importing any ``app`` module loads ``app.main``, which opens the job and leaderboard store.
+os.environ.setdefault("JOB_QUEUE_PATH", str(Path(tempfile.mkdtemp(prefix="skill-tests-")) / "jobs.sqlite3"))
+
+RESUME_LINES = [
+    "Jane Doe",
+    "Experience",
+    "Built python services with docker and aws at Acme",
+    "Skills",
+    "python sql machine learning pytorch",
+    "Education",
+    "BSc Computer Science",
+]
+
+
+@pytest.fixture
+def resume_pdf(tmp_path):
+    """A two-page text PDF with a known word count."""
+    canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+    path = tmp_path / "resume.pdf"
+    pdf = canvas.Canvas(str(path))
+    y = 800
+    for line in RESUME_LINES:
+        pdf.drawString(72, y, line)
+        y -= 20
+    pdf.showPage()
+    pdf.drawString(72, 800, "Projects")
+    pdf.drawString(72, 780, "fastapi kubernetes deployment")
+    pdf.save()
+    return path
+
+
+@pytest.fixture
+def resume_word_count():
+    return sum(len(line.split()) for line in RESUME_LINES) + 4
+
+
+@pytest.fixture
+def layout_document():
+    """Build a ``ParsedDocument`` from ``(x, y, text)`` lines on a Letter page, ~6pt per character."""
+    from app.schemas import Coordinate, SpatialToken
+    from app.services.spatial_extractor import ParsedDocument
+    from app.services.spatial_index import SpatialIndex
+
+    def build(lines, page_size=(612.0, 792.0), height=10.0):
+        width, page_height = page_size
+        tokens = []
+        for x, y, text in lines:
+            for word in text.split():
+                x1 = x + 6.0 * len(word)
+                coordinate = Coordinate(
+                    x0=x, y0=y, x1=x1, y1=y + height, page_width=width, page_height=page_height, page=1
+                )
+                tokens.append(SpatialToken(text=word, coordinate=coordinate))
+                x = x1 + 4.0
+        page_sizes = {1: page_size}
+        return ParsedDocument(tokens=tokens, page_sizes=page_sizes, layout=SpatialIndex(tokens, page_sizes))
+
+    return build
@@ -0,0 +1,60 @@
+import itertools
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.dl_models.crf_decoding import viterbi_decode  # noqa: E402
+
+LENGTHS = [7, 1, 4, 7, 3, 2]
+NUM_TAGS = 3
+
+
+def _random_crf(seed: int):
+    generator = torch.Generator().manual_seed(seed)
+    batch, seq_len = len(LENGTHS), max(LENGTHS)
+    emissions = torch.randn(batch, seq_len, NUM_TAGS, generator=generator)
+    mask = torch.zeros(batch, seq_len, dtype=torch.long)
+    for i, length in enumerate(LENGTHS):
+        mask[i, :length] = 1
+    # Padding carries junk emissions; the decode must ignore it.
+    emissions = emissions + (1 - mask).unsqueeze(-1) * 50.0
+    start = torch.randn(NUM_TAGS, generator=generator)
+    end = torch.randn(NUM_TAGS, generator=generator)
+    transitions = torch.randn(NUM_TAGS, NUM_TAGS, generator=generator)
+    return emissions, mask, start, end, transitions
+
+
+def _brute_force(emissions, length, start, end, transitions):
+    def score(path):
+        total = start[path[0]] + emissions[0, path[0]] + end[path[-1]]
+        for t in range(1, length):
+            total = total + transitions[path[t - 1], path[t]] + emissions[t, path[t]]
+        return float(total)
+
+    return list(max(itertools.product(range(NUM_TAGS), repeat=length), key=score))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_exhaustive_search(seed):
+    emissions, mask, start, end, transitions = _random_crf(seed)
+    tags = viterbi_decode(emissions, mask, start, end, transitions)
+    assert tags.shape == mask.shape
+    for i, length in enumerate(LENGTHS):
+        assert tags[i, :length].tolist() == _brute_force(emissions[i], length, start, end, transitions)
+        assert tags[i, length:].eq(0).all()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_torchcrf_decode(seed):
+    torchcrf = pytest.importorskip("torchcrf")
+    emissions, mask, start, end, transitions = _random_crf(seed)
+    crf = torchcrf.CRF(NUM_TAGS, batch_first=True)
+    with torch.no_grad():
+        crf.start_transitions.copy_(start)
+        crf.end_transitions.copy_(end)
+        crf.transitions.copy_(transitions)
+    expected = crf.decode(emissions, mask=mask.bool())
+    tags = viterbi_decode(emissions, mask, crf.start_transitions, crf.end_transitions, crf.transitions)
+    for i, length in enumerate(LENGTHS):
+        assert tags[i, :length].tolist() == expected[i]
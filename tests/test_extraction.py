@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from src.spatial_engine.extraction import (
+    BACKENDS,
+    DEFAULT_MAX_PARSERS,
+    ExtractedPage,
+    ExtractedWord,
+    ExtractionBusy,
+    ExtractionLimits,
+    ExtractionReport,
+    compare_backends,
+    extract_pages,
+    iter_pages,
+    set_max_parsers,
+)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backend_extracts_every_word(backend, resume_pdf, resume_word_count):
+    pytest.importorskip("pdfplumber" if backend == "pdfplumber" else "pypdfium2")
+    pages = extract_pages(resume_pdf, backend)
+    assert len(pages) == 2
+    assert sum(len(page.words) for page in pages) == resume_word_count
+    for page in pages:
+        for word in page.words:
+            assert 0 <= word.x0 < word.x1 <= page.width
+            assert 0 <= word.top < word.bottom <= page.height
+
+
+def test_backends_agree(resume_pdf, resume_word_count):
+    pytest.importorskip("pdfplumber")
+    pytest.importorskip("pypdfium2")
+    report = compare_backends(resume_pdf, "pdfplumber", "pdfium")
+    assert report["reference_words"] == report["candidate_words"] == resume_word_count
+    assert report["f1"] >= 0.95
+    assert report["seconds"]["pdfplumber"] > 0 and report["seconds"]["pdfium"] > 0
+    assert report["speedup"] > 0
+
+
+def test_coordinate_aware_parser(resume_pdf, resume_word_count):
+    pytest.importorskip("pdfplumber")
+    from app.services.spatial_parser import CoordinateAwareParser
+
+    parsed = CoordinateAwareParser().parse_pdf(resume_pdf)
+    assert len(parsed.words) == resume_word_count
+    assert parsed.full_text.split()[:2] == ["Jane", "Doe"]
+    assert {word.section for word in parsed.words} <= {"header", "body", "footer"}
+    assert parsed.words[0].section == "header"
+
+
+def _slow_pages(pdf_path, report=None):
+    if report is not None:
+        report.total_pages = 3
+    for index, delay in enumerate((0.0, 5.0, 0.0)):
+        time.sleep(delay)
+        yield ExtractedPage(index=index, width=100.0, height=100.0, words=[ExtractedWord("word", 1, 1, 2, 2)])
+
+
+def test_deadline_abandons_a_slow_page(monkeypatch):
+    monkeypatch.setitem(BACKENDS, "slow", _slow_pages)
+    report = ExtractionReport()
+    start = time.monotonic()
+    pages = list(iter_pages("unused.pdf", "slow", ExtractionLimits(deadline_seconds=0.3), report))
+    assert time.monotonic() - start < 1.0
+    assert len(pages) == 1
+    assert report.truncated and report.reason == "deadline"
+
+
+def test_page_and_word_budgets(resume_pdf):
+    pytest.importorskip("pdfplumber")
+    report = ExtractionReport()
+    pages = list(iter_pages(resume_pdf, "pdfplumber", ExtractionLimits(max_pages=1, deadline_seconds=10), report))
+    assert len(pages) == 1 and report.reason == "max_pages" and report.total_pages == 2
+
+    report = ExtractionReport()
+    pages = list(iter_pages(resume_pdf, "pdfplumber", ExtractionLimits(max_words=5), report))
+    assert sum(len(page.words) for page in pages) == 5 and report.reason == "max_words"
+
+
+def test_abandoned_parses_hold_reader_slots(monkeypatch):
+    release = threading.Event()
+
+    def stuck_pages(pdf_path, report=None):
+        release.wait(5.0)
+        yield ExtractedPage(index=0, width=100.0, height=100.0, words=[ExtractedWord("word", 1, 1, 2, 2)])
+
+    monkeypatch.setitem(BACKENDS, "stuck", stuck_pages)
+    limits = ExtractionLimits(deadline_seconds=0.1)
+    set_max_parsers(1)
+    try:
+        assert list(iter_pages("unused.pdf", "stuck", limits, ExtractionReport())) == []
+        start = time.monotonic()
+        with pytest.raises(ExtractionBusy):
+            list(iter_pages("unused.pdf", "stuck", limits, ExtractionReport()))
+        assert time.monotonic() - start < 0.1
+
+        release.set()
+        deadline = time.monotonic() + 2.0
+        while True:
+            try:
+                assert len(list(iter_pages("unused.pdf", "stuck", limits, ExtractionReport()))) == 1
+                break
+            except ExtractionBusy:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+    finally:
+        release.set()
+        set_max_parsers(DEFAULT_MAX_PARSERS)
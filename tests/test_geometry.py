@@ -0,0 +1,16 @@
+from app.services.geometry import pack_geometry, unpack_geometry
+from app.services.shared_core import ExtractedPage, ExtractedWord
+
+
+def test_round_trip_uses_one_based_pages():
+    pages = [
+        ExtractedPage(index=0, width=612.0, height=792.0, words=[ExtractedWord("Jane", 72, 60, 100, 70)]),
+        ExtractedPage(index=1, width=595.0, height=842.0, words=[ExtractedWord("Python", 72, 90, 110, 100),
+                                                                 ExtractedWord("Zürich", 120, 90, 160, 100)]),
+    ]
+    decoded = unpack_geometry(pack_geometry(pages))
+
+    assert decoded["words"] == ["Jane", "Python", "Zürich"]
+    assert decoded["pages"].tolist() == [1, 2, 2]
+    assert decoded["page_sizes"][decoded["pages"][1] - 1].tolist() == [595.0, 842.0]
+    assert decoded["boxes"][1].tolist() == [72.0, 90.0, 110.0, 100.0]
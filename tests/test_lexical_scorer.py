@@ -0,0 +1,46 @@
+from app.services.lexical_scorer import BM25WindowIndex, LexicalStats, bm25_pair_scores
+
+APPLIED = "Built python services with docker and deployed them to production"
+NAMED = "I keep a pet python named Monty and read about reptiles"
+
+CORPUS = [
+    "built python services with docker deployed to production",
+    "python data pipelines deployed to production on aws",
+    "developed python services and rest api endpoints",
+    "wrote python scripts for data pipelines",
+    "python backend services in production",
+    "hobbies hiking chess and my pet dog",
+    "sql reporting dashboards for finance",
+]
+
+
+def test_default_profile_separates_applied_from_named():
+    applied, named = bm25_pair_scores([("python", APPLIED), ("python", NAMED)])
+    assert applied > 0.8
+    assert named < 0.2
+
+
+def test_hit_alone_is_not_evidence():
+    assert bm25_pair_scores([("python", "python")]) == [0.0]
+    assert bm25_pair_scores([("python", "Skills: python")]) == [0.0]
+
+
+def test_corpus_profile_and_request_independence():
+    stats = LexicalStats.build((line.split() for line in CORPUS), ["python", "sql"], window=10, min_mentions=3)
+    assert "python" in stats.profiles and "sql" not in stats.profiles
+    assert "production" in stats.profile("python") and "python" not in stats.profile("python")
+
+    applied, named = bm25_pair_scores([("python", APPLIED), ("python", NAMED)], stats)
+    assert applied > 2 * named
+
+    alone = bm25_pair_scores([("python", APPLIED)], stats)[0]
+    long_neighbour = bm25_pair_scores([("python", APPLIED), ("sql", " ".join(["filler"] * 200))], stats)[0]
+    assert alone == applied == long_neighbour
+
+
+def test_round_trip(tmp_path):
+    stats = LexicalStats.build((line.split() for line in CORPUS), ["python"], window=10, min_mentions=1)
+    loaded = LexicalStats.load(stats.save(tmp_path / "stats.json"))
+    tokens = APPLIED.lower().split()
+    index = BM25WindowIndex(tokens, [(0, len(tokens))], stats=loaded)
+    assert index.span_scores(["python"]) == bm25_pair_scores([("python", APPLIED)], stats)
@@ -0,0 +1,75 @@
+import json
+import multiprocessing
+import os
+import shutil
+import time
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.pipeline import pdf_corpus  # noqa: E402
+
+needs_fork = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="patched worker must be inherited by forked processes"
+)
+
+
+@pytest.fixture
+def corpus(tmp_path, resume_pdf):
+    root = tmp_path / "pdfs"
+    root.mkdir()
+    for i in range(7):
+        shutil.copy(resume_pdf, root / f"r{i}.pdf")
+    (root / "broken.pdf").write_text("not a pdf")
+    return root
+
+
+def _read(output):
+    return [json.loads(line) for shard in sorted(output.glob("*.jsonl")) for line in shard.open()]
+
+
+def test_ingest_and_resume(corpus, tmp_path):
+    output = tmp_path / "shards"
+    manifest = pdf_corpus.ingest_pdf_corpus(corpus, output, shard_size=3, workers=2)
+    assert manifest["records"] == 7 and manifest["failed"] == 1
+
+    records = _read(output)
+    record = records[0]
+    assert len(record["tokens"]) == len(record["bbox"]) == len(record["section"]) == len(record["labels"])
+    assert all(0 <= v <= pdf_corpus.BBOX_SCALE for box in record["bbox"] for v in box)
+    assert {"experience", "skills", "education", "projects"} <= set(record["section"])
+    assert "B-SKILL" in record["labels"]
+
+    (output / "shard-00001.jsonl").unlink()
+    manifest = pdf_corpus.ingest_pdf_corpus(corpus, output, shard_size=3, workers=2)
+    assert manifest["records"] == 7
+    assert len(_read(output)) == 7
+
+    with pytest.raises(ValueError):
+        pdf_corpus.ingest_pdf_corpus(corpus, output, shard_size=4)
+
+
+def _crashing_worker(args):
+    if args[1] == "r3.pdf":
+        os._exit(1)
+    if args[1] == "r5.pdf":
+        time.sleep(60)
+    return _real_worker(args)
+
+
+_real_worker = pdf_corpus._ingest_worker
+
+
+@needs_fork
+def test_worker_crash_and_hang_are_recorded(corpus, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_corpus, "_ingest_worker", _crashing_worker)
+    output = tmp_path / "shards"
+    manifest = pdf_corpus.ingest_pdf_corpus(corpus, output, shard_size=3, workers=2, timeout_seconds=5)
+
+    failed = {source: error for shard in manifest["shards"].values() for source, error in shard["failed"]}
+    assert set(failed) == {"broken.pdf", "r3.pdf", "r5.pdf"}
+    assert "crashed" in failed["r3.pdf"]
+    assert "Timed out" in failed["r5.pdf"]
+    assert manifest["records"] == 5
+    assert sorted(r["source"] for r in _read(output)) == ["r0.pdf", "r1.pdf", "r2.pdf", "r4.pdf", "r6.pdf"]
@@ -0,0 +1,99 @@
+from app.services.contextual_verifier import coordinate_weight
+from app.services.spatial_extractor import SpatialExtractor
+
+INTERESTS_THEN_EXPERIENCE = [
+    (72, 100, "Jane Doe"),
+    (72, 160, "Interests: python chess hiking"),
+    (72, 200, "Experience"),
+    (72, 214, "Built python services with docker at Acme"),
+    (72, 228, "Maintained python data pipelines on AWS"),
+]
+
+
+def _hits(parsed, skill, window, limit=8):
+    extractor = SpatialExtractor()
+    lowered = [token.text.lower() for token in parsed.tokens]
+    hits = extractor.occurrences(parsed, lowered, skill, window, limit)
+    return [(parsed.tokens[i].text, extractor.section_for(parsed, i)) for i in hits]
+
+
+def test_interests_mention_does_not_hide_experience(layout_document):
+    parsed = layout_document(INTERESTS_THEN_EXPERIENCE)
+
+    hits = _hits(parsed, "python", window=50)
+    # The experience snippets overlap each other, not the interests line.
+    assert [section for _, section in hits] == ["hobbies", "experience"]
+    assert max(coordinate_weight(section) for _, section in hits) == 1.0
+
+    assert [section for _, section in _hits(parsed, "python", window=2)] == ["hobbies", "experience", "experience"]
+
+
+def test_limit_keeps_every_section(layout_document):
+    lines = [(72, 160, "Interests: python chess hiking"), (72, 200, "Experience")]
+    lines += [(72, 214 + 14 * k, f"python project {k}") for k in range(10)]
+    hits = _hits(layout_document(lines), "python", window=1, limit=3)
+    assert [section for _, section in hits] == ["hobbies", "experience", "experience"]
+
+
+TWO_COLUMNS_UNDER_HEADER = [
+    (240, 60, "Jane Doe"),
+    (220, 74, "Software Engineer"),
+    (200, 88, "jane@example.com 555 0100"),
+    (50, 160, "Skills"),
+    (50, 174, "Python SQL Docker"),
+    (50, 220, "Hobbies"),
+    (50, 234, "Chess hiking"),
+    (320, 160, "Acme Corp 2019"),
+    (320, 200, "Experience"),
+    (320, 214, "Built python services"),
+    (320, 260, "Education"),
+    (320, 274, "BSc Computer Science"),
+]
+
+
+def _sections(parsed):
+    extractor = SpatialExtractor()
+    return {token.text: extractor.section_for(parsed, i) for i, token in enumerate(parsed.tokens)}
+
+
+def test_header_above_columns_is_read_first(layout_document):
+    parsed = layout_document(TWO_COLUMNS_UNDER_HEADER)
+    words = [parsed.tokens[i].text for i in parsed.reading_order]
+    assert words[:8] == ["Jane", "Doe", "Software", "Engineer", "jane@example.com", "555", "0100", "Skills"]
+    assert words.index("Hobbies") < words.index("Acme")
+
+    sections = _sections(parsed)
+    assert {sections[w] for w in ("Jane", "Doe", "Software", "Engineer", "jane@example.com")} == {"header"}
+    assert sections["Python"] == "skills"
+    assert sections["Chess"] == "hobbies"
+    assert sections["Built"] == "experience"
+    assert sections["BSc"] == "education"
+
+
+def test_later_column_does_not_inherit_previous_column(layout_document):
+    parsed = layout_document(TWO_COLUMNS_UNDER_HEADER)
+    acme = next(i for i, token in enumerate(parsed.tokens) if token.text == "Acme")
+    assert parsed.layout.section(acme) is None
+    assert _sections(parsed)["Acme"] == "body"
+
+
+def test_heading_above_title_and_date_row(layout_document):
+    parsed = layout_document(
+        [
+            (72, 160, "Experience"),
+            (72, 200, "Engineer at Acme"),
+            (480, 200, "2019 2021"),
+            (72, 214, "Built python services"),
+        ]
+    )
+    sections = _sections(parsed)
+    assert sections["Engineer"] == sections["Built"] == sections["2019"] == "experience"
+
+
+def test_snippets_and_neighbours_stay_in_their_column(layout_document):
+    parsed = layout_document(TWO_COLUMNS_UNDER_HEADER)
+    python = next(i for i, token in enumerate(parsed.tokens) if token.text == "Python")
+    assert SpatialExtractor().context_for(parsed, python, 50) == "Skills Python SQL Docker"
+
+    near = {parsed.tokens[i].text for i in parsed.layout.near(1, (50, 174, 60, 184), margin=2)}
+    assert near == {"Python"}
@@ -1,16 +1,19 @@
 import argparse
 import json
+import time
 from pathlib import Path
 from typing import Dict, List
 
 import numpy as np
 import torch
+import torch.nn as nn
 from sklearn.metrics import precision_recall_fscore_support
 from torch.utils.data import DataLoader, Dataset
 from transformers import AutoTokenizer
 
+from src.dl_models.feature_cache import CachedFeatureDataset, build_feature_cache
 from src.dl_models.skill_classifier import SkillExtractModel
-from src.pipeline.dataset_builder import build_processed_jsonl, load_jsonl
+from src.pipeline.dataset_builder import build_processed_jsonl, load_jsonl, split_by_group
 from src.pipeline.preprocess import SPATIAL_WEIGHTS
 from src.semantic_engine.embedding_model import ContextualEmbeddingModel
 from src.spatial_engine.coordinate_mapper import integrity_score, section_to_weight
@@ -81,15 +84,54 @@ def maybe_download_kaggle_dataset(dataset_path: Path):
         )
 
 
+@torch.no_grad()
+def teacher_logits(teacher, batch):
+    """Teacher emission and section logits from the encoder and heads only; distillation never needs its Viterbi tags."""
+    out = teacher.encoder(
+        input_ids=batch["input_ids"],
+        attention_mask=batch["attention_mask"],
+        bbox=batch["bbox"],
+        section_ids=batch["section_ids"],
+    )
+    return {
+        "emissions": teacher.tag_head(out.sequence_output),
+        "section_logits": teacher.section_head(out.pooled_output),
+    }
+
+
+def distillation_loss(student_out, teacher_out, attention_mask, hard_loss, args):
+    """Hard BIO/section loss plus temperature-scaled KL to the teacher's emission and section logits."""
+    t = args.distill_temperature
+    mask = attention_mask.bool()
+    tag_kl = nn.functional.kl_div(
+        nn.functional.log_softmax(student_out["emissions"][mask] / t, dim=-1),
+        nn.functional.softmax(teacher_out["emissions"][mask] / t, dim=-1),
+        reduction="batchmean",
+    ) * (t * t)
+    section_kl = nn.functional.kl_div(
+        nn.functional.log_softmax(student_out["section_logits"] / t, dim=-1),
+        nn.functional.softmax(teacher_out["section_logits"] / t, dim=-1),
+        reduction="batchmean",
+    ) * (t * t)
+    return args.hard_loss_weight * hard_loss + args.tag_distill_weight * tag_kl + args.section_distill_weight * section_kl
+
+
 def evaluate(model, dataloader, device, embedder):
     model.eval()
     all_true, all_pred = [], []
     integrity_values = []
+    n_tokens, n_docs, infer_seconds = 0, 0, 0.0
     with torch.no_grad():
         for batch in dataloader:
             inputs = {k: v.to(device) for k, v in batch.items() if k in {"input_ids", "attention_mask", "bbox", "section_ids"}}
-            out = model(**inputs)
+            start = time.perf_counter()
+            out = model.predict(**inputs, with_section=False)
             preds = out["token_predictions"]
+            if device.type == "cuda":
+                torch.cuda.synchronize()
+            infer_seconds += time.perf_counter() - start
+            n_tokens += int(batch["attention_mask"].sum())
+            n_docs += batch["input_ids"].shape[0]
             labels = batch["labels"].numpy()
             ids = batch["input_ids"].numpy()
 
@@ -120,18 +162,25 @@ def evaluate(model, dataloader, device, embedder):
         "false_positive_rate": float(fpr),
         "integrity_mean": float(np.mean(integrity_values)) if integrity_values else 0.0,
         "integrity_std": float(np.std(integrity_values)) if integrity_values else 0.0,
+        "tokens_per_second": n_tokens / infer_seconds if infer_seconds else 0.0,
+        "documents_per_second": n_docs / infer_seconds if infer_seconds else 0.0,
     }
 
 
 def main(args):
-    dataset_path = Path(args.dataset_path)
-    maybe_download_kaggle_dataset(dataset_path)
-    processed_path = Path("data/processed/resume_dataset.jsonl")
-    build_processed_jsonl(str(dataset_path), str(processed_path), max_samples=args.max_samples)
-    records = load_jsonl(str(processed_path))
-
-    split = int(0.8 * len(records))
-    train_records, test_records = records[:split], records[split:]
+    if args.pdf_shards:
+        # Real-geometry shards from src.pipeline.pdf_corpus replace the CSV preprocessing step.
+        records = load_jsonl(args.pdf_shards)
+    else:
+        dataset_path = Path(args.dataset_path)
+        maybe_download_kaggle_dataset(dataset_path)
+        processed_path = Path("data/processed/resume_dataset.jsonl")
+        build_processed_jsonl(str(dataset_path), str(processed_path), max_samples=args.max_samples,
+                              dedup=args.dedup, dedup_threshold=args.dedup_threshold)
+        records = load_jsonl(str(processed_path))
+
+    # Near-duplicate groups stay on one side so templated resumes cannot leak into the test split.
+    train_records, test_records = split_by_group(records, 0.8)
 
     tokenizer = AutoTokenizer.from_pretrained(args.base_model)
     train_ds = ResumeDataset(train_records, tokenizer, args.max_length)
@@ -140,11 +189,34 @@ def main(args):
     test_loader = DataLoader(test_ds, batch_size=args.batch_size)
 
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = SkillExtractModel(base_model=args.base_model).to(device)
-    opt = torch.optim.AdamW(model.parameters(), lr=args.lr)
+    teacher = None
+    if args.distill_from:
+        teacher = SkillExtractModel(base_model=args.base_model)
+        teacher.load_state_dict(torch.load(args.distill_from, map_location="cpu"))
+        teacher.to(device).eval()
+        student_backbone = args.student_model or args.base_model
+        model = SkillExtractModel(base_model=student_backbone, num_layers=args.student_layers or None).to(device)
+        if model.encoder.backbone.config.vocab_size != teacher.encoder.backbone.config.vocab_size:
+            raise ValueError("Student backbone must share the teacher's tokenizer/vocabulary.")
+    else:
+        model = SkillExtractModel(base_model=args.base_model).to(device)
+
+    lr = args.lr
+    if args.freeze_backbone:
+        if teacher is not None:
+            raise ValueError("--freeze_backbone trains heads on cached features and cannot be combined with --distill_from.")
+        # Backbone states never change, so compute them once and train fusion, heads and CRF from the cache.
+        model.encoder.freeze_backbone()
+        cache_dir = build_feature_cache(model.encoder, train_ds, args.feature_cache_dir, args.base_model,
+                                        batch_size=args.batch_size, device=device)
+        train_loader = DataLoader(CachedFeatureDataset(train_ds, cache_dir), batch_size=args.batch_size, shuffle=True)
+        lr = args.head_lr
+    opt = torch.optim.AdamW([p for p in model.parameters() if p.requires_grad], lr=lr)
 
     for epoch in range(args.epochs):
         model.train()
+        if args.freeze_backbone:
+            model.encoder.backbone.eval()
         losses = []
         for batch in train_loader:
             batch = {k: v.to(device) for k, v in batch.items()}
@@ -155,8 +227,11 @@ def main(args):
                 section_ids=batch["section_ids"],
                 labels=batch["labels"],
                 section_labels=batch["section_label"],
+                hidden_states=batch.get("hidden_states"),
             )
             loss = out["loss"]
+            if teacher is not None:
+                loss = distillation_loss(out, teacher_logits(teacher, batch), batch["attention_mask"], loss, args)
             opt.zero_grad()
             loss.backward()
             opt.step()
@@ -169,9 +244,21 @@ def main(args):
     metrics["false_skill_detection_reduction_vs_baseline"] = (baseline_fpr - metrics["false_positive_rate"]) / baseline_fpr
 
     Path("models").mkdir(exist_ok=True)
-    torch.save(model.state_dict(), "models/skill_extract_model.pt")
+    if teacher is not None:
+        metrics["student"] = {
+            "backbone": args.student_model or args.base_model,
+            "num_layers": model.encoder.backbone.config.num_hidden_layers,
+            "parameters": sum(p.numel() for p in model.parameters()),
+            "teacher": args.distill_from,
+            "teacher_metrics": evaluate(teacher, test_loader, device, embedder),
+            "temperature": args.distill_temperature,
+        }
+        model_out, metrics_out = "models/skill_extract_student.pt", "models/student_metrics.json"
+    else:
+        model_out, metrics_out = "models/skill_extract_model.pt", "models/training_metrics.json"
+    torch.save(model.state_dict(), model_out)
     tokenizer.save_pretrained("models/tokenizer")
-    with open("models/training_metrics.json", "w", encoding="utf-8") as f:
+    with open(metrics_out, "w", encoding="utf-8") as f:
         json.dump(metrics, f, indent=2)
 
     print(json.dumps(metrics, indent=2))
@@ -186,4 +273,22 @@ if __name__ == "__main__":
     parser.add_argument("--max_length", type=int, default=256)
     parser.add_argument("--max_samples", type=int, default=1200)
     parser.add_argument("--base_model", type=str, default="distilbert-base-uncased")
+    parser.add_argument("--pdf_shards", type=str, default=None,
+                        help="Directory of JSONL shards from src.pipeline.pdf_corpus to train on instead of the CSV")
+    parser.add_argument("--dedup", type=str, default="group", choices=["off", "group", "drop"],
+                        help="MinHash LSH near-duplicate handling: keep groups on one side of the split, or drop them")
+    parser.add_argument("--dedup_threshold", type=float, default=0.8, help="Estimated Jaccard similarity for near-duplicates")
+    parser.add_argument("--distill_from", type=str, default=None,
+                        help="Teacher checkpoint (built on --base_model); enables knowledge distillation")
+    parser.add_argument("--student_model", type=str, default=None,
+                        help="Student backbone sharing the teacher's tokenizer (default: --base_model)")
+    parser.add_argument("--student_layers", type=int, default=2, help="Transformer blocks kept in the student (0 = all)")
+    parser.add_argument("--distill_temperature", type=float, default=2.0)
+    parser.add_argument("--hard_loss_weight", type=float, default=0.5)
+    parser.add_argument("--tag_distill_weight", type=float, default=0.5)
+    parser.add_argument("--section_distill_weight", type=float, default=0.1)
+    parser.add_argument("--freeze_backbone", action="store_true",
+                        help="Cache frozen backbone hidden states once and train only fusion, heads and CRF")
+    parser.add_argument("--feature_cache_dir", type=str, default="data/feature_cache")
+    parser.add_argument("--head_lr", type=float, default=1e-3, help="Learning rate used with --freeze_backbone")
     main(parser.parse_args())